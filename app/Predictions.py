@@ -1,15 +1,17 @@
-import json
 import os
-import requests
 import pandas as pd
 import plotly.graph_objects as go
-from shapely.geometry import Point
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from sklearn.ensemble import RandomForestRegressor
 from dateutil.relativedelta import relativedelta
 from dotenv import load_dotenv
 import streamlit as st
 import mock_station_csv
+import hcdp_client
+import station_index
+import forecast_models
+import station_series
 
 # Load environment variables from .env file. override=True because
 # Streamlit pre-populates MAPBOX_API_KEY as an empty string from its own
@@ -18,9 +20,95 @@ import mock_station_csv
 load_dotenv(override=True)
 
 
-def _generate_mock_rainfall_forecast_plot(month: str, latitude: float, longitude: float):
+# Trees of a single forecast RandomForest are fitted in parallel (-1 = all
+# cores). generate_rainfall_forecasts() instead fetches/trains up to
+# FORECAST_MAX_WORKERS stations at once (one per core by default) with
+# single-job forests, so a batch uses every core without starting
+# FORECAST_MAX_WORKERS times as many threads as there are cores.
+# Overridable via .env.
+FORECAST_N_JOBS = int(os.getenv("FORECAST_N_JOBS", "-1"))
+FORECAST_MAX_WORKERS = int(os.getenv("FORECAST_MAX_WORKERS", str(os.cpu_count() or 1)))
+
+
+# Model inputs derived from the date. The mock data only spans Jan-Jul of
+# one year, so the mock models leave the year out.
+LIVE_FEATURES = ["day", "month", "year"]
+MOCK_FEATURES = ["day", "month"]
+
+
+def _new_forecast_model(n_jobs=FORECAST_N_JOBS):
+    return RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=n_jobs)
+
+
+def _records_to_frame(records, value_column="rainfall"):
+    """
+    Turns raw {"date", "value"} station records (HCDP results or
+    mock_station_csv.load_station_daily_series) into a date-sorted
+    DataFrame(date, <value_column>), parsing every date in one
+    pd.to_datetime call. Records without a value are dropped.
+    """
+    df = pd.DataFrame.from_records(records, columns=["date", "value"])
+    df = df.dropna(subset=["value"])
+    return pd.DataFrame({
+        "date": pd.to_datetime(df["date"], format="ISO8601"),
+        value_column: pd.to_numeric(df["value"]).astype("float64"),
+    }).sort_values("date", ignore_index=True)
+
+
+def _add_date_features(df, features):
+    """Adds the requested day/month/year columns from df["date"] via .dt."""
+    dates = df["date"].dt
+    for feature in features:
+        df[feature] = getattr(dates, feature)
+    return df
+
+
+def _fit_forecast_model(df_train, features, n_jobs=FORECAST_N_JOBS):
+    model = _new_forecast_model(n_jobs)
+    model.fit(_add_date_features(df_train.copy(), features)[features], df_train["rainfall"])
+    return model
+
+
+def _predict(model, forecast_dates, features):
+    df_forecast = _add_date_features(pd.DataFrame({"date": pd.to_datetime(forecast_dates)}), features)
+    df_forecast["predicted_rainfall"] = model.predict(df_forecast[features])
+    return df_forecast
+
+
+def _mock_station_model(skn, n_jobs=FORECAST_N_JOBS):
+    """
+    Returns (model, df_actual) for one mock station: its real daily rainfall
+    readings (see mock_station_csv.py) and a forecast model trained on them.
     """
-    Builds an actual-vs-predicted rainfall plot for demo/screenshot purposes
+    series = mock_station_csv.load_station_daily_series("rainfall_new", skn)
+    if not series:
+        raise ValueError("No mock rainfall data available for the nearest station.")
+
+    df_actual = _records_to_frame(series)
+
+    def train_model():
+        return _fit_forecast_model(df_actual, MOCK_FEATURES, n_jobs)
+
+    # The mock files can be replaced without their date range changing, so
+    # their modification times are part of the model key
+    model = forecast_models.get_model(
+        f"mock-{skn}", "rainfall", df_actual["date"].min(), df_actual["date"].max(), train_model,
+        version=mock_station_csv.daily_data_version("rainfall_new"),
+    )
+    return model, df_actual
+
+
+def _mock_forecast(model, month):
+    # Only Jan-Jul 2026 was downloaded, so the requested month is mapped onto that range
+    requested_month = datetime.strptime("01/" + month, "%d/%m/%Y").month
+    target_month = mock_station_csv.available_month(requested_month)
+    forecast_dates = pd.date_range(datetime(2026, target_month, 1), periods=28, freq="D")
+    return _predict(model, forecast_dates, MOCK_FEATURES)
+
+
+def _build_mock_rainfall_forecast(month: str, latitude: float, longitude: float):
+    """
+    Builds actual and predicted rainfall for demo/screenshot purposes
     when no live OAUTH_TOKEN is configured yet, using a real nearby station's
     real daily rainfall readings (see mock_station_csv.py) both as the
     "actual" series and as training data for a real forecast model. Only
@@ -33,35 +121,69 @@ def _generate_mock_rainfall_forecast_plot(month: str, latitude: float, longitude
     if skn is None:
         raise ValueError("No mock station data available.")
 
-    series = mock_station_csv.load_station_daily_series("rainfall_new", skn)
-    if not series:
-        raise ValueError("No mock rainfall data available for the nearest station.")
+    model, df_actual = _mock_station_model(skn)
+    return df_actual, _mock_forecast(model, month)
 
-    df_actual = pd.DataFrame(series).rename(columns={"value": "rainfall"})
 
-    df_train = df_actual.copy()
-    df_train["day"] = df_train["date"].dt.day
-    df_train["month"] = df_train["date"].dt.month
+def _forecast_windows(month):
+    """
+    Returns the (start, end) datetime windows used by the live forecast:
+    {"forecast": today through the end of month, "train": the 36 months
+    before today, "actual": ~4 months before today through the forecast end}.
+    """
+    target_month = datetime.strptime("01/" + month, "%d/%m/%Y")
+    forecast_start = datetime.now()
+    forecast_end = (target_month.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+    if forecast_end < forecast_start:
+        # Requested month is in the past relative to today - nothing to forecast.
+        forecast_end = forecast_start
 
-    model = RandomForestRegressor(n_estimators=100, random_state=42)
-    model.fit(df_train[["day", "month"]], df_train["rainfall"])
+    return {
+        "forecast": (forecast_start, forecast_end),
+        "train": (forecast_start - relativedelta(months=36), forecast_start - timedelta(days=1)),
+        "actual": (forecast_start - relativedelta(months=4), forecast_end),
+    }
 
-    requested_month = datetime.strptime("01/" + month, "%d/%m/%Y").month
-    target_month = mock_station_csv.available_month(requested_month)
-    forecast_dates = [datetime(2026, target_month, day) for day in range(1, 29)]
-    df_forecast = pd.DataFrame({
-        "date": forecast_dates,
-        "day": [d.day for d in forecast_dates],
-        "month": [d.month for d in forecast_dates],
-    })
-    df_forecast["predicted_rainfall"] = model.predict(df_forecast[["day", "month"]])
 
-    _plot_actual_vs_predicted(df_actual, df_forecast)
+def _live_station_series(station_id, windows, hcdp_api_token):
+    """
+    Returns the station's daily rainfall over the union of the training and
+    actuals windows, as one DataFrame(date, rainfall). The two windows mostly
+    overlap, so they are fetched together (and incrementally, through
+    station_series) and sliced locally with _slice_window().
+    """
+    start = min(windows["train"][0], windows["actual"][0])
+    end = max(windows["train"][1], windows["actual"][1])
+    series = station_series.get_daily_series(station_id, "rainfall", start, end, hcdp_api_token)
+    return series.rename(columns={"value": "rainfall"})
+
 
+def _slice_window(df, start, end):
+    dates = df["date"]
+    return df[(dates >= pd.Timestamp(start).normalize()) & (dates <= pd.Timestamp(end).normalize())]
 
-def generate_rainfall_forecast_plot(month: str, latitude: float, longitude: float):
+
+def _live_station_model(station_id, windows, hcdp_api_token, n_jobs=FORECAST_N_JOBS):
+    # The training window only moves once a day, so a model fitted earlier
+    # today for this station is reused and nothing is fetched for training.
+    train_start, train_end = windows["train"]
+
+    def train_model():
+        df_series = _live_station_series(station_id, windows, hcdp_api_token)
+        return _fit_forecast_model(_slice_window(df_series, train_start, train_end), LIVE_FEATURES, n_jobs)
+
+    return forecast_models.get_model(station_id, "rainfall", train_start, train_end, train_model)
+
+
+def _live_forecast(model, forecast_start, forecast_end):
+    forecast_dates = pd.date_range(forecast_start, periods=(forecast_end - forecast_start).days + 1, freq="D")
+    return _predict(model, forecast_dates, LIVE_FEATURES)
+
+
+def build_rainfall_forecast(month: str, latitude: float, longitude: float):
     """
-    Generate and display a Plotly chart of actual vs predicted daily rainfall.
+    Computes actual and predicted daily rainfall without plotting them, so
+    callers (e.g. main.py's st.cache_data wrapper) can cache the result.
 
     Forecast range: today through the end of the input month.
     Actuals: the ~4 months before today through the end of the input month.
@@ -70,6 +192,10 @@ def generate_rainfall_forecast_plot(month: str, latitude: float, longitude: floa
         month (str): "MM/YYYY" format (e.g., "06/2025")
         latitude (float): Latitude of location
         longitude (float): Longitude of location
+
+    Returns:
+        tuple: (df_actual with date/rainfall, df_forecast with
+        date/predicted_rainfall)
     """
 
     # Read the API token from the environment variable. If it's not set
@@ -78,116 +204,96 @@ def generate_rainfall_forecast_plot(month: str, latitude: float, longitude: floa
     # real HCDP token is available.
     hcdp_api_token = os.getenv("OAUTH_TOKEN")
     if not hcdp_api_token:
-        return _generate_mock_rainfall_forecast_plot(month, latitude, longitude)
-
-    api_base_url = "https://api.hcdp.ikewai.org"
-    header = {"Authorization": f"Bearer {hcdp_api_token}"}
-
-    def query_stations(values, name, limit=10000, offset=0):
-        params = {"name": name}
-        for key in values:
-            params[f"value.{key}"] = values[key]
-        params = {"q": json.dumps(params), "limit": limit, "offset": offset}
-        url = f"{api_base_url}/stations"
-        res = requests.get(url, params=params, headers=header)
-        res.raise_for_status()
-        return [item["value"] for item in res.json()["result"]]
-
-    def get_station_metadata():
-        res = query_stations({}, name="hcdp_station_metadata")
-        return {m[m["id_field"]]: m for m in res}
-
-    def get_closest_station_id(lat, lon, metadata):
-        point = Point(lon, lat)
-        closest_station, min_dist = None, float("inf")
-        for sid, meta in metadata.items():
-            try:
-                station_point = Point(float(meta["lng"]), float(meta["lat"]))
-                dist = point.distance(station_point)
-                if dist < min_dist:
-                    min_dist = dist
-                    closest_station = sid
-            except:
-                continue
-        return closest_station
-
-    target_month = datetime.strptime("01/" + month, "%d/%m/%Y")
-    forecast_start = datetime.now()
-    forecast_end = (target_month.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
-    if forecast_end < forecast_start:
-        # Requested month is in the past relative to today - nothing to forecast.
-        forecast_end = forecast_start
+        return _build_mock_rainfall_forecast(month, latitude, longitude)
 
-    train_start = forecast_start - relativedelta(months=36)
-    train_end = forecast_start - timedelta(days=1)
+    windows = _forecast_windows(month)
 
-    actual_start = forecast_start - relativedelta(months=4)
-    actual_end = forecast_end
-
-    metadata = get_station_metadata()
-    station_id = get_closest_station_id(latitude, longitude, metadata)
+    station_id = station_index.nearest_station(
+        hcdp_client.get_station_spatial_index(hcdp_api_token), latitude, longitude
+    )
     if not station_id:
         raise ValueError("No nearby station found.")
 
-    values_train = {
-        "station_id": station_id,
-        "datatype": "rainfall",
-        "production": "new",
-        "period": "day",
-        "fill": "partial",
-        "date": {
-            "$gte": train_start.strftime("%Y-%m-%d"),
-            "$lte": train_end.strftime("%Y-%m-%d")
-        }
-    }
-    train_raw = query_stations(values_train, name="hcdp_station_value")
-    df_train = pd.DataFrame([
-        {
-            "date": datetime.strptime(r["date"], "%Y-%m-%d"),
-            "day": datetime.strptime(r["date"], "%Y-%m-%d").day,
-            "month": datetime.strptime(r["date"], "%Y-%m-%d").month,
-            "year": datetime.strptime(r["date"], "%Y-%m-%d").year,
-            "rainfall": float(r["value"])
-        }
-        for r in train_raw if "value" in r
-    ])
-
-    model = RandomForestRegressor(n_estimators=100, random_state=42)
-    model.fit(df_train[["day", "month", "year"]], df_train["rainfall"])
-
-    forecast_dates = [forecast_start + timedelta(days=i) for i in range((forecast_end - forecast_start).days + 1)]
-    df_forecast = pd.DataFrame({
-        "date": forecast_dates,
-        "day": [d.day for d in forecast_dates],
-        "month": [d.month for d in forecast_dates],
-        "year": [d.year for d in forecast_dates]
-    })
-    df_forecast["predicted_rainfall"] = model.predict(df_forecast[["day", "month", "year"]])
-
-    values_actual = {
-        "station_id": station_id,
-        "datatype": "rainfall",
-        "production": "new",
-        "period": "day",
-        "fill": "partial",
-        "date": {
-            "$gte": actual_start.strftime("%Y-%m-%d"),
-            "$lte": actual_end.strftime("%Y-%m-%d")
-        }
-    }
-    actual_raw = query_stations(values_actual, name="hcdp_station_value")
-    df_actual = pd.DataFrame([
-        {
-            "date": datetime.strptime(r["date"], "%Y-%m-%d"),
-            "rainfall": float(r["value"])
-        }
-        for r in actual_raw if "value" in r
-    ]).sort_values("date")
+    # One (incremental) fetch serves both the actuals and, on a model cache
+    # miss, the training data.
+    df_series = _live_station_series(station_id, windows, hcdp_api_token)
+    model = _live_station_model(station_id, windows, hcdp_api_token)
+    df_forecast = _live_forecast(model, *windows["forecast"])
+    df_actual = _slice_window(df_series, *windows["actual"])
+    return df_actual, df_forecast
 
-    _plot_actual_vs_predicted(df_actual, df_forecast)
 
+def generate_rainfall_forecast_plot(month: str, latitude: float, longitude: float):
+    """
+    Generate and display a Plotly chart of actual vs predicted daily rainfall
+    (see build_rainfall_forecast for the date ranges).
+
+    Parameters:
+        month (str): "MM/YYYY" format (e.g., "06/2025")
+        latitude (float): Latitude of location
+        longitude (float): Longitude of location
+    """
+    plot_actual_vs_predicted(*build_rainfall_forecast(month, latitude, longitude))
+
+
+def generate_rainfall_forecasts(month: str, latitudes, longitudes, max_workers: int = None):
+    """
+    Batch version of the rainfall forecast, without plotting: resolves the
+    nearest station of every point in one batched lookup, then trains (or
+    loads) each distinct station's model concurrently.
+
+    Parameters:
+        month (str): "MM/YYYY" format (e.g., "06/2025")
+        latitudes, longitudes: array-likes of point coordinates
+        max_workers (int): Stations processed at once (defaults to FORECAST_MAX_WORKERS)
+
+    Returns:
+        pd.DataFrame: one row per point and forecast day, with columns
+        point (position in the inputs), latitude, longitude, station_id,
+        date, predicted_rainfall
+    """
+    latitudes = list(latitudes)
+    longitudes = list(longitudes)
+    hcdp_api_token = os.getenv("OAUTH_TOKEN")
 
-def _plot_actual_vs_predicted(df_actual, df_forecast):
+    if hcdp_api_token:
+        index = hcdp_client.get_station_spatial_index(hcdp_api_token)
+        if index is None:
+            raise ValueError("No nearby station found.")
+        nearest_ids, _ = station_index.nearest_stations(index, latitudes, longitudes, k=1)
+        windows = _forecast_windows(month)
+
+        def forecast_station(station_id):
+            model = _live_station_model(station_id, windows, hcdp_api_token, n_jobs=1)
+            return _live_forecast(model, *windows["forecast"])
+    else:
+        nearest = mock_station_csv.find_nearest_stations("rainfall_new", latitudes, longitudes, k=1)
+        if nearest is None:
+            raise ValueError("No mock station data available.")
+        nearest_ids = nearest[0]
+
+        def forecast_station(skn):
+            model, _ = _mock_station_model(skn, n_jobs=1)
+            return _mock_forecast(model, month)
+
+    station_ids = nearest_ids[:, 0].tolist()
+    unique_ids = list(dict.fromkeys(station_ids))
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers or FORECAST_MAX_WORKERS, len(unique_ids)))) as pool:
+        forecasts = dict(zip(unique_ids, pool.map(forecast_station, unique_ids)))
+
+    frames = []
+    for point, (latitude, longitude, station_id) in enumerate(zip(latitudes, longitudes, station_ids)):
+        frame = forecasts[station_id][["date", "predicted_rainfall"]].copy()
+        frame.insert(0, "point", point)
+        frame.insert(1, "latitude", latitude)
+        frame.insert(2, "longitude", longitude)
+        frame.insert(3, "station_id", station_id)
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def plot_actual_vs_predicted(df_actual, df_forecast):
+    """Displays the actual vs predicted rainfall chart for build_rainfall_forecast()'s result."""
     fig = go.Figure()
 
     fig.add_trace(go.Scatter(
@@ -0,0 +1,26 @@
+"""
+The dashboard's default inputs, shared by main.py and warmup.py so the
+warmup fills exactly the cache keys the pages ask for first.
+"""
+
+# Sidebar date defaults for the Daily and Monthly views
+DEFAULT_DAILY_DATE = "12/01/2016"
+DEFAULT_MONTHLY_DATE = "12/2016"
+
+# Default "Enter Prediction Month" on the forecast pages
+DEFAULT_FORECAST_MONTH = "04/2025"
+
+# Islands drawn on the "All Islands" map, in display order
+# (Niihau and Kahoolawe have no station data worth showing).
+ALL_ISLANDS = ["Oahu", "Kauai", "Molokai", "Lānai", "Maui", "Hawaii (Big Island)"]
+
+# Sidebar page -> (latitude, longitude) of its rainfall forecast
+FORECAST_LOCATIONS = {
+    "All Islands": (21.31667, -158.06667),
+    "Oʻahu": (21.688333, -157.952500),
+    "Kauaʻi": (21.981570, -159.342206),
+    "Molokaʻi": (21.31667, -158.06667),
+    "Lānaʻi": (21.31667, -158.06667),
+    "Maui": (21.31667, -158.06667),
+    "Hawaiʻi (Big Island)": (19.83639, -155.613),
+}
@@ -1,46 +1,4 @@
-import json
-import pytz
-import requests
-import pandas as pd
-from datetime import datetime, timedelta
-from shapely.geometry import Point, Polygon
-from dotenv import load_dotenv
-import os
-import mock_station_csv
-
-# Load environment variables from .env file. override=True because
-# Streamlit pre-populates MAPBOX_API_KEY as an empty string from its own
-# config system before this ever runs, and load_dotenv() otherwise leaves
-# already-set variables alone - silently ignoring the real value in .env.
-load_dotenv(override=True)
-
-
-def _generate_mock_rainfall_data(date_list, matched_island):
-    """
-    Builds rainfall station data for demo/screenshot purposes when no live
-    OAUTH_TOKEN is configured yet, using real station data downloaded from
-    HCDP (see mock_station_csv.py). Returns the same shape as the real
-    HCDP-backed path (columns: Time, lat, lon, rainfall), so callers don't
-    need to change, and this stops being used automatically once a real
-    OAUTH_TOKEN is set in .env.
-    """
-    month = mock_station_csv.available_month(date_list[0].month)
-    records = []
-
-    if len(date_list) == 1:
-        # Daily view: real observations for that specific day
-        display_date = date_list[0].strftime("%m/%d/%Y")
-        stations = mock_station_csv.load_station_values("rainfall_new", matched_island, month, day=date_list[0].day)
-        for s in stations:
-            records.append({"Time": display_date, "lat": s["lat"], "lon": s["lon"], "rainfall": s["value"]})
-    else:
-        # Monthly view: one real monthly total per station
-        display_date = date_list[0].strftime("%m/%d/%Y")
-        stations = mock_station_csv.load_station_values("rainfall_new", matched_island, month)
-        for s in stations:
-            records.append({"Time": display_date, "lat": s["lat"], "lon": s["lon"], "rainfall": s["value"]})
-
-    return pd.DataFrame(records)
+import station_data
 
 
 def get_station_data_for_period(date_input: str, island_name: str, variable: str):
@@ -55,156 +13,30 @@ def get_station_data_for_period(date_input: str, island_name: str, variable: str
     Returns:
     - pd.DataFrame: Daily station-level data for the given time and island
     """
+    return get_station_data_for_islands(date_input, [island_name], variable)[island_name]
 
-    # Read the API token from the environment variable. If it's not set yet,
-    # rainfall requests fall back to generated mock data (see below) so the
-    # app is still usable for demos before a real HCDP token is available.
-    hcdp_api_token = os.getenv("OAUTH_TOKEN")
-    if not hcdp_api_token and variable != "rainfall":
-        raise ValueError("OAUTH_TOKEN is not set in the .env file")
-
-    api_base_url = "https://api.hcdp.ikewai.org"
-    header = {"Authorization": f"Bearer {hcdp_api_token}"}
-
-    def query_stations(values, name, limit=10000, offset=0):
-        params = {"name": name}
-        for key in values:
-            params[f"value.{key}"] = values[key]
-        params = {"q": json.dumps(params), "limit": limit, "offset": offset}
-        stations_ep = "/stations"
-        url = f"{api_base_url}{stations_ep}"
-        res = requests.get(url, params=params, headers=header)
-        res.raise_for_status()
-        return [item["value"] for item in res.json()["result"]]
-
-    def get_station_metadata():
-        res = query_stations({}, name="hcdp_station_metadata")
-        return {m[m["id_field"]]: m for m in res}
-
-    def get_station_data(values, metadata=None, limit=10000, offset=0):
-        res = query_stations(values, name="hcdp_station_value", limit=limit, offset=offset)
-        if metadata:
-            return [item | metadata.get(item["station_id"], {}) for item in res]
-        return res
-
-    # Define all island polygons
-    islands = {
-        "Hawaii (Big Island)": Polygon([(-156.1, 18.9), (-154.7, 18.9), (-154.7, 20.3), (-156.1, 20.3)]),
-        "Maui": Polygon([(-156.8, 20.5), (-156.2, 20.5), (-156.2, 21.0), (-156.8, 21.0)]),
-        "Oahu": Polygon([(-158.3, 21.2), (-157.6, 21.2), (-157.6, 21.8), (-158.3, 21.8)]),
-        "Kauai": Polygon([(-159.8, 21.8), (-159.2, 21.8), (-159.2, 22.3), (-159.8, 22.3)]),
-        "Molokai": Polygon([(-157.4, 20.5), (-156.7, 20.5), (-156.7, 21.2), (-157.4, 21.2)]),
-        "Lānai": Polygon([(-157.1, 20.7), (-156.8, 20.7), (-156.8, 21.0), (-157.1, 21.0)]),
-        "Niihau": Polygon([(-160.3, 21.8), (-160.0, 21.8), (-160.0, 22.0), (-160.3, 22.0)]),
-        "Kahoolawe": Polygon([(-156.7, 20.5), (-156.5, 20.5), (-156.5, 20.7), (-156.7, 20.7)])
-    }
-
-    def get_island(lat, lon):
-        point = Point(lon, lat)
-        for name, poly in islands.items():
-            if poly.contains(point):
-                return name
-        return "Unknown or offshore"
 
-    # Normalize island input
-    island_name = island_name.lower()
-    matched_island = None
-    for name in islands.keys():
-        if island_name in name.lower():
-            matched_island = name
-            break
-    if not matched_island:
-        raise ValueError(f"Island '{island_name}' not recognized.")
-
-    # Determine date range
-    try:
-        if len(date_input) == 7:  # MM/YYYY
-            start_date = datetime.strptime("01/" + date_input, "%d/%m/%Y")
-            end_date = (start_date.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
-        elif len(date_input) == 10:  # MM/DD/YYYY
-            start_date = datetime.strptime(date_input, "%m/%d/%Y")
-            end_date = start_date
-        else:
-            raise ValueError("Date input must be in MM/YYYY or MM/DD/YYYY format.")
-    except ValueError as e:
-        raise ValueError(f"Date parsing failed: {e}")
-
-    date_list = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
-
-    if not hcdp_api_token and variable == "rainfall":
-        return _generate_mock_rainfall_data(date_list, matched_island)
-
-    metadata = get_station_metadata()
-    records = []
-
-    for date in date_list:
-        date_str = date.strftime("%Y-%m-%d")
-        display_date = date.strftime("%m/%d/%Y")
-        all_station_data = {}
-
-        if variable == "temperature":
-            # for agg in ["max", "min", "mean"]:
-            for agg in ["max"]:
-                values = {
-                    "datatype": "temperature",
-                    "aggregation": agg,
-                    "period": "day",
-                    "date": date_str
-                }
-                data = get_station_data(values, metadata)
-                for item in data:
-                    if not ("lat" in item and "lng" in item): continue
-                    lat, lon = float(item["lat"]), float(item["lng"])
-                    if get_island(lat, lon) != matched_island:
-                        continue
-                    sid = item["station_id"]
-                    if sid not in all_station_data:
-                        all_station_data[sid] = {
-                            "Time": display_date,
-                            "lat": lat,
-                            "lon": lon
-                        }
-                    all_station_data[sid][f"{agg}-temp"] = float(item["value"])
-
-        elif variable == "rainfall":
-            values = {
-                "datatype": "rainfall",
-                "production": "new",
-                "period": "day",
-                "date": date_str
-            }
-            data = get_station_data(values, metadata)
-            for item in data:
-                if not ("lat" in item and "lng" in item): continue
-                lat, lon = float(item["lat"]), float(item["lng"])
-                if get_island(lat, lon) != matched_island:
-                    continue
-                sid = item["station_id"]
-                if sid not in all_station_data:
-                    all_station_data[sid] = {
-                        "Time": display_date,
-                        "lat": lat,
-                        "lon": lon
-                    }
-                all_station_data[sid]["rainfall"] = float(item["value"])
+def get_station_data_for_islands(date_input: str, island_names: list, variable: str, max_concurrency: int = None):
+    """
+    Statewide version of get_station_data_for_period: the period's station
+    values are fetched once by station_data.get_station_data and split into
+    one frame per requested island.
 
-        for station_record in all_station_data.values():
-            row = {
-                "Time": station_record["Time"],
-                "lat": station_record["lat"],
-                "lon": station_record["lon"]
-            }
-            if variable == "max-temp":
-                row["max-temp"] = station_record.get("max-temp")
-                # row["min-temp"] = station_record.get("min-temp")
-                # row["avg-temp"] = station_record.get("mean-temp")
-            elif variable == "rainfall":
-                row["rainfall"] = station_record.get("rainfall")
-            records.append(row)
+    Parameters:
+    - date_input (str): Either "MM/YYYY" for full month or "MM/DD/YYYY" for a specific day
+    - island_names (list): Island names (e.g., ["Oahu", "Maui", "Lanai"])
+    - variable (str): Either "max-temp" or "rainfall"
+    - max_concurrency (int): Max simultaneous HCDP queries (defaults to station_data.HCDP_MAX_CONCURRENCY)
 
-    df = pd.DataFrame(records)
-    return df
+    Returns:
+    - dict: {island_name: pd.DataFrame} keyed by the names passed in, each
+      frame shaped like get_station_data_for_period's result (columns Time,
+      lat, lon, <variable>)
+    """
+    column = station_data.VARIABLE_ALIASES.get(variable, variable)
+    wide = station_data.get_station_data(date_input, [column], island_names, max_concurrency)
+    return station_data.split_by_island(wide, island_names, [column])
 
 
 # df_test = get_station_data_for_period("01/01/2016","Oahu","rainfall")
-# print(df_test)
\ No newline at end of file
+# print(df_test)
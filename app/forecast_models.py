@@ -0,0 +1,109 @@
+"""
+Registry of fitted forecast models, so the Future Climate Predictions page
+only runs inference on a rerun instead of refitting a RandomForest.
+
+Models are keyed by (station id, target variable, training window start,
+training window end, data version). The window is tracked in whole days, so
+a station's model is retrained at most once a day, when the window moves
+forward. The optional data version covers training data that can change
+without the window moving, e.g. a replaced mock CSV.
+Fitted models are kept in an in-memory LRU and, if HCDP_CACHE_DIR is
+enabled, persisted with joblib so they survive restarts.
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+import joblib
+import hcdp_client
+
+# Max fitted models kept in memory. Overridable via FORECAST_MODEL_CACHE_SIZE.
+MODEL_CACHE_SIZE = int(os.getenv("FORECAST_MODEL_CACHE_SIZE", "32"))
+
+MODEL_DIR = os.path.join(hcdp_client.CACHE_DIR, "models") if hcdp_client.CACHE_DIR else None
+
+# (station_id, target, train_start, train_end, version) -> fitted model, oldest first
+_models = OrderedDict()
+_models_lock = threading.Lock()
+
+
+def get_model(station_id, target, train_start, train_end, train_fn, version=""):
+    """
+    Returns the fitted model for this station/target/training window.
+
+    train_start, train_end: dates (or datetimes) bounding the training data
+    train_fn: zero-argument callable that fetches the training data and
+              returns a fitted model; only called on a cache miss (memory
+              and disk), so callers should do their data fetching inside it.
+    version: identifies the training data beyond its window (e.g.
+             mock_station_csv.daily_data_version()); a different version
+             means a different model
+    """
+    key = (str(station_id), target, _day(train_start), _day(train_end), str(version))
+
+    with _models_lock:
+        if key in _models:
+            _models.move_to_end(key)
+            return _models[key]
+
+    model = _load_model(key)
+    if model is None:
+        model = train_fn()
+        _save_model(key, model)
+
+    with _models_lock:
+        _models[key] = model
+        _models.move_to_end(key)
+        while len(_models) > MODEL_CACHE_SIZE:
+            _models.popitem(last=False)
+    return model
+
+
+def _day(value):
+    return value.strftime("%Y-%m-%d")
+
+
+def _model_prefix(station_id, target):
+    safe = [re.sub(r"[^A-Za-z0-9.-]+", "-", part) for part in (target, station_id)]
+    return "__".join(safe) + "__"
+
+
+def _model_path(key):
+    station_id, target, train_start, train_end, version = key
+    suffix = f"__{re.sub(r'[^A-Za-z0-9.-]+', '-', version)}" if version else ""
+    return os.path.join(MODEL_DIR, f"{_model_prefix(station_id, target)}{train_start}__{train_end}{suffix}.joblib")
+
+
+def _load_model(key):
+    if not MODEL_DIR:
+        return None
+    path = _model_path(key)
+    if not os.path.exists(path):
+        return None
+    try:
+        return joblib.load(path)
+    except Exception:
+        # Unreadable (e.g. written by another scikit-learn version) - retrain.
+        return None
+
+
+def _save_model(key, model):
+    if not MODEL_DIR:
+        return
+    station_id, target = key[:2]
+    path = _model_path(key)
+    try:
+        os.makedirs(MODEL_DIR, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        joblib.dump(model, tmp_path)
+        os.replace(tmp_path, path)
+        # Older training windows (and data versions) for this
+        # station/target are superseded.
+        prefix = _model_prefix(station_id, target)
+        for name in os.listdir(MODEL_DIR):
+            if name.startswith(prefix) and name.endswith(".joblib") and os.path.join(MODEL_DIR, name) != path:
+                os.remove(os.path.join(MODEL_DIR, name))
+    except OSError:
+        # Persisting is best-effort; the in-memory copy is still valid.
+        pass
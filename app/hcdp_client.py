@@ -0,0 +1,276 @@
+"""
+Shared helpers for talking to the HCDP API (https://api.hcdp.ikewai.org),
+used by station_data.py (through station_store) and Predictions.py instead
+of each of them defining its own nested query_stations()/
+get_station_metadata().
+
+All requests go through one pooled requests.Session, so connections (and
+their TLS handshakes) are reused across calls and threads, every request
+has a timeout, and 429/5xx responses are retried with exponential backoff.
+
+The station directory (hcdp_station_metadata) is one of the largest
+payloads the app downloads and changes maybe once a month, so it is kept
+in a process-wide cache keyed by API base URL, with a TTL, and optionally
+mirrored to disk so a cold start doesn't have to fetch it either. A
+station_id -> island index is precomputed and cached alongside it.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from dotenv import load_dotenv
+import island_geometry
+import station_index
+
+# Load environment variables from .env file. override=True because
+# Streamlit pre-populates MAPBOX_API_KEY as an empty string from its own
+# config system before this ever runs, and load_dotenv() otherwise leaves
+# already-set variables alone - silently ignoring the real value in .env.
+load_dotenv(override=True)
+
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+API_BASE_URL = os.getenv("HCDP_API_BASE_URL", "https://api.hcdp.ikewai.org")
+
+# How long a downloaded station directory is trusted before it is fetched
+# again (seconds). Overridable via HCDP_METADATA_TTL in .env.
+METADATA_TTL_SECONDS = int(os.getenv("HCDP_METADATA_TTL", str(24 * 60 * 60)))
+
+# Where on-disk cache files are written. Set HCDP_CACHE_DIR to an empty
+# string to keep everything in memory only.
+CACHE_DIR = os.getenv("HCDP_CACHE_DIR", os.path.normpath(os.path.join(_APP_DIR, "..", ".cache")))
+
+# (connect, read) timeouts in seconds for every HCDP request, so a stuck
+# request can't block the Streamlit script thread forever.
+REQUEST_TIMEOUT = (
+    float(os.getenv("HCDP_CONNECT_TIMEOUT", "5")),
+    float(os.getenv("HCDP_READ_TIMEOUT", "60")),
+)
+
+# Retries for 429/5xx responses and connection errors, sleeping
+# HCDP_BACKOFF_FACTOR * 2**(attempt - 1) seconds between attempts (or
+# whatever Retry-After asks for).
+MAX_RETRIES = int(os.getenv("HCDP_MAX_RETRIES", "3"))
+BACKOFF_FACTOR = float(os.getenv("HCDP_BACKOFF_FACTOR", "0.5"))
+
+# Max open connections per host; extra concurrent requests wait for a free
+# connection instead of opening more.
+MAX_CONNECTIONS_PER_HOST = int(os.getenv("HCDP_MAX_CONNECTIONS_PER_HOST", "10"))
+
+_session = None
+_session_lock = threading.Lock()
+
+# api_base_url -> {"fetched_at", "metadata": {station_id: metadata},
+#                 "island_index": {station_id: island}}
+_metadata_cache = {}
+_metadata_lock = threading.Lock()
+
+
+def get_session():
+    """Returns the process-wide pooled Session used for every HCDP request."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=MAX_RETRIES,
+                backoff_factor=BACKOFF_FACTOR,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset({"GET"}),
+                # Hand the last failed response back so raise_for_status()
+                # still raises the usual HTTPError.
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_maxsize=MAX_CONNECTIONS_PER_HOST,
+                pool_block=True,
+                max_retries=retry,
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def query_stations(values, name, token, limit=10000, offset=0, api_base_url=API_BASE_URL):
+    """
+    Runs one /stations query and returns the "value" of every result.
+
+    values: filters applied as value.<key> (e.g. {"datatype": "rainfall"})
+    name: HCDP collection, e.g. "hcdp_station_value" or "hcdp_station_metadata"
+    token: HCDP OAUTH_TOKEN
+    """
+    params = {"name": name}
+    for key in values:
+        params[f"value.{key}"] = values[key]
+    params = {"q": json.dumps(params), "limit": limit, "offset": offset}
+    url = f"{api_base_url}/stations"
+    res = get_session().get(
+        url,
+        params=params,
+        headers={"Authorization": f"Bearer {token}"},
+        timeout=REQUEST_TIMEOUT,
+    )
+    res.raise_for_status()
+    return [item["value"] for item in res.json()["result"]]
+
+
+def iter_station_pages(values, name, token, page_size=10000, prefetch=True, api_base_url=API_BASE_URL):
+    """
+    Lazily yields query_stations() results one limit/offset page at a time,
+    until a page comes back short (or, as a fallback, empty), so large
+    queries (e.g. a 36-month training pull or a statewide month) are
+    neither truncated at the first page nor held in memory as one huge
+    response, while a query that fits in one page costs one request.
+
+    With prefetch=True the next page is downloaded in a background thread
+    while the caller is still processing the current one.
+    """
+    def fetch(offset):
+        return query_stations(values, name, token, limit=page_size, offset=offset, api_base_url=api_base_url)
+
+    if not prefetch:
+        offset = 0
+        while True:
+            page = fetch(offset)
+            if not page:
+                return
+            yield page
+            if len(page) < page_size:
+                return
+            offset += len(page)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        offset = 0
+        future = pool.submit(fetch, offset)
+        while True:
+            page = future.result()
+            if not page:
+                return
+            last = len(page) < page_size
+            if not last:
+                offset += len(page)
+                future = pool.submit(fetch, offset)
+            yield page
+            if last:
+                return
+
+
+def query_all_stations(values, name, token, page_size=10000, api_base_url=API_BASE_URL):
+    """Same as query_stations, but collects every page from iter_station_pages()."""
+    results = []
+    for page in iter_station_pages(values, name, token, page_size=page_size, api_base_url=api_base_url):
+        results.extend(page)
+    return results
+
+
+def get_station_metadata(token, api_base_url=API_BASE_URL, force_refresh=False):
+    """
+    Returns the HCDP station directory as {station_id: metadata}.
+
+    Served from the in-memory cache (then the on-disk copy, if enabled)
+    while it is younger than METADATA_TTL_SECONDS; pass force_refresh=True
+    to always download a fresh copy.
+    """
+    return _get_station_directory(token, api_base_url, force_refresh)["metadata"]
+
+
+def get_station_island_index(token, api_base_url=API_BASE_URL, force_refresh=False):
+    """
+    Returns {station_id: island name} for every station in the directory
+    that has a lat/lng. A station's island never changes, so this is
+    computed once per metadata download and cached (and persisted) with it,
+    turning per-island filtering into a dictionary lookup.
+    """
+    return _get_station_directory(token, api_base_url, force_refresh)["island_index"]
+
+
+def get_station_spatial_index(token, api_base_url=API_BASE_URL, force_refresh=False):
+    """
+    Returns a station_index nearest-station index over every station in the
+    directory with a lat/lng. It is built lazily the first time it is asked
+    for after each metadata download and then reused (in memory only).
+    """
+    directory = _get_station_directory(token, api_base_url, force_refresh)
+    with _metadata_lock:
+        if "spatial_index" not in directory:
+            located = [(sid, m) for sid, m in directory["metadata"].items() if "lat" in m and "lng" in m]
+            directory["spatial_index"] = station_index.build_station_index(
+                [sid for sid, _ in located],
+                [float(m["lat"]) for _, m in located],
+                [float(m["lng"]) for _, m in located],
+            )
+        return directory["spatial_index"]
+
+
+def _get_station_directory(token, api_base_url, force_refresh):
+    with _metadata_lock:
+        now = time.time()
+        if not force_refresh:
+            cached = _metadata_cache.get(api_base_url) or _read_metadata_file(api_base_url)
+            if cached and now - cached["fetched_at"] < METADATA_TTL_SECONDS:
+                _metadata_cache[api_base_url] = cached
+                return cached
+
+        res = query_all_stations({}, "hcdp_station_metadata", token, api_base_url=api_base_url)
+        metadata = {m[m["id_field"]]: m for m in res}
+        directory = {
+            "fetched_at": now,
+            "metadata": metadata,
+            "island_index": _build_island_index(metadata),
+        }
+        _metadata_cache[api_base_url] = directory
+        _write_metadata_file(api_base_url, directory)
+        return directory
+
+
+def _build_island_index(metadata):
+    located = [(sid, m) for sid, m in metadata.items() if "lat" in m and "lng" in m]
+    lats = [float(m["lat"]) for _, m in located]
+    lons = [float(m["lng"]) for _, m in located]
+    station_islands = island_geometry.assign_islands(lats, lons)
+    return {sid: island for (sid, _), island in zip(located, station_islands.tolist())}
+
+
+def _metadata_path(api_base_url):
+    if not CACHE_DIR:
+        return None
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", api_base_url).strip("_")
+    return os.path.join(CACHE_DIR, f"station_metadata_{slug}.json")
+
+
+def _read_metadata_file(api_base_url):
+    path = _metadata_path(api_base_url)
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            directory = json.load(f)
+        if "island_index" not in directory:
+            # Written before the island index existed - rebuild it once.
+            directory["island_index"] = _build_island_index(directory["metadata"])
+        return directory
+    except (OSError, ValueError, KeyError):
+        # A corrupt or half-written cache file is just a cache miss.
+        return None
+
+
+def _write_metadata_file(api_base_url, directory):
+    path = _metadata_path(api_base_url)
+    if not path:
+        return
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({key: directory[key] for key in ("fetched_at", "metadata", "island_index")}, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Persisting is best-effort; the in-memory copy is still valid.
+        pass
@@ -0,0 +1,84 @@
+"""
+Server-side hexagonal binning for the station maps in main.py.
+
+pydeck's HexagonLayer ships every station row to the browser and bins it
+there. hexbin_points() does the same aggregation with NumPy instead, on a
+pointy-top hexagon grid whose radius is given in meters (like the
+HexagonLayer's radius), so only one row per occupied cell has to be sent,
+e.g. to a ColumnLayer with disk_resolution=6.
+
+Points are projected onto a local equirectangular plane around the data's
+mean latitude, which is accurate to well under a percent across a single
+island or the whole island chain.
+"""
+
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_M = 6371008.8
+
+_SQRT3 = np.sqrt(3.0)
+
+
+def hexbin_points(lats, lons, weights, radius_m):
+    """
+    Bins points into hexagons of radius_m meters (center to vertex).
+
+    lats, lons, weights: aligned array-likes; NaN weights are ignored
+    Returns a DataFrame with one row per occupied cell: lat, lon (cell
+    center), value (sum of weights, like HexagonLayer's default elevation
+    aggregation) and count (points in the cell).
+    """
+    lats = np.asarray(lats, dtype="float64")
+    lons = np.asarray(lons, dtype="float64")
+    weights = np.asarray(weights, dtype="float64")
+    keep = ~(np.isnan(lats) | np.isnan(lons) | np.isnan(weights))
+    lats, lons, weights = lats[keep], lons[keep], weights[keep]
+    if len(lats) == 0:
+        return pd.DataFrame({column: pd.Series(dtype="float64") for column in ["lat", "lon", "value", "count"]})
+
+    lat0 = np.radians(lats.mean())
+    x = np.radians(lons) * np.cos(lat0) * EARTH_RADIUS_M
+    y = np.radians(lats) * EARTH_RADIUS_M
+
+    # Fractional axial coordinates, then cube rounding to the nearest cell
+    q = (_SQRT3 / 3 * x - y / 3) / radius_m
+    r = (2 / 3 * y) / radius_m
+    cube_x, cube_z = q, r
+    cube_y = -cube_x - cube_z
+    rx, ry, rz = np.round(cube_x), np.round(cube_y), np.round(cube_z)
+    dx, dy, dz = np.abs(rx - cube_x), np.abs(ry - cube_y), np.abs(rz - cube_z)
+    fix_x = (dx > dy) & (dx > dz)
+    fix_z = ~fix_x & (dz >= dy)
+    rx = np.where(fix_x, -ry - rz, rx)
+    rz = np.where(fix_z, -rx - ry, rz)
+
+    cells, cell_index = np.unique(np.column_stack([rx, rz]).astype(np.int64), axis=0, return_inverse=True)
+    cell_index = cell_index.ravel()
+    values = np.bincount(cell_index, weights=weights, minlength=len(cells))
+    counts = np.bincount(cell_index, minlength=len(cells))
+
+    center_x = radius_m * _SQRT3 * (cells[:, 0] + cells[:, 1] / 2)
+    center_y = radius_m * 1.5 * cells[:, 1]
+    return pd.DataFrame({
+        "lat": np.degrees(center_y / EARTH_RADIUS_M),
+        "lon": np.degrees(center_x / (np.cos(lat0) * EARTH_RADIUS_M)),
+        "value": values,
+        "count": counts,
+    })
+
+
+def scale_elevation(values, elevation_range):
+    """
+    Maps cell values linearly from their [min, max] onto elevation_range,
+    as HexagonLayer does with its elevation domain, so a ColumnLayer fed
+    these heights looks the same.
+    """
+    values = np.asarray(values, dtype="float64")
+    low, high = float(elevation_range[0]), float(elevation_range[1])
+    if len(values) == 0:
+        return values
+    span = values.max() - values.min()
+    if span == 0:
+        return np.full(values.shape, high)
+    return low + (values - values.min()) / span * (high - low)
@@ -0,0 +1,155 @@
+"""
+Materialized per-island aggregates (count/stations/min/max/mean/median/
+p90/sum) of station values, read by island_bar_chart in main.py and by
+island_summary.py so neither has to reduce station-level rows on a rerun.
+
+Rows are keyed by (island, variable, period, date): period is "day" or
+"month", and date is "YYYY-MM-DD" or "YYYY-MM". The table is built
+incrementally: only the (period, date) combinations that are missing are
+computed, with one station_data.get_station_data call over the station
+store, and then written to a SQLite file under HCDP_CACHE_DIR.
+
+The statistics are over every station-day reading in the period, so a
+month's max is the hottest daily reading and its median the median daily
+reading. stations counts the stations behind those readings, so
+sum / stations is the average station total for the period (e.g. monthly
+rainfall per station). Periods newer than
+station_store.STORE_FINAL_AFTER_DAYS may still be revised, so they are
+computed but not materialized. Variables served from the mock CSVs (see
+station_data.variable_source) are never materialized either: those files
+can be replaced, and mock_station_csv already caches them by mtime.
+"""
+
+import os
+from datetime import date, timedelta
+import numpy as np
+import pandas as pd
+import hcdp_client
+import island_geometry
+import sqlite_cache
+import station_data
+import station_store
+
+# v2: month statistics over station-day readings rather than per-station
+# monthly values, and no source column (mock rows are not stored)
+# v3: stations counted by station_id, not by distinct coordinates
+AGGREGATES_PATH = os.path.join(hcdp_client.CACHE_DIR, "island_aggregates_v3.sqlite") if hcdp_client.CACHE_DIR else None
+
+STATISTICS = ["count", "stations", "min", "max", "mean", "median", "p90", "sum"]
+
+_COUNT_STATISTICS = ["count", "stations"]
+
+_KEY_COLUMNS = ["island", "variable", "period", "date"]
+
+
+def get_island_aggregates(date_input: str, variables: list, island_names: list):
+    """
+    Returns the aggregates for one day or month.
+
+    Parameters:
+    - date_input (str): Either "MM/YYYY" for full month or "MM/DD/YYYY" for a specific day
+    - variables (list): station_data variables (e.g. ["rainfall", "max-temp"])
+    - island_names (list): Island names (e.g., ["Oahu", "Maui", "Lanai"])
+
+    Returns:
+    - pd.DataFrame: one row per (island, variable) with columns island (the
+      name as passed in), variable, period, date and STATISTICS. An island
+      without readings has count and stations 0 and NaN statistics.
+    """
+    variables = list(dict.fromkeys(station_data.VARIABLE_ALIASES.get(v, v) for v in variables))
+    islands = list(dict.fromkeys(island_geometry.match_island(name) for name in island_names))
+    period, period_key, final = _period(date_input)
+    live = [v for v in variables if station_data.variable_source(v) == "live"]
+
+    stored = pd.DataFrame(columns=_KEY_COLUMNS + STATISTICS)
+    if AGGREGATES_PATH and live:
+        stored = _read(live, islands, period, period_key)
+    have = set(zip(stored["island"], stored["variable"]))
+    missing = [v for v in variables if any((island, v) not in have for island in islands)]
+    if missing:
+        computed = _compute(date_input, missing, islands, period, period_key)
+        materialize = [v for v in missing if final and v in live]
+        if AGGREGATES_PATH and materialize:
+            _write(computed[computed["variable"].isin(materialize)])
+        stored = pd.concat([stored[~stored["variable"].isin(missing)], computed], ignore_index=True)
+
+    by_island = stored.set_index(["island", "variable"])
+    rows = []
+    for name in island_names:
+        island = island_geometry.match_island(name)
+        for variable in variables:
+            row = by_island.loc[(island, variable)]
+            rows.append({"island": name, "variable": variable, "period": period, "date": period_key,
+                         **{statistic: row[statistic] for statistic in STATISTICS}})
+    return pd.DataFrame(rows, columns=["island", "variable", "period", "date"] + STATISTICS)
+
+
+def _period(date_input):
+    """(period, date key, whether the period's readings are final) for a dashboard date input."""
+    date_list = station_data.parse_date_list(date_input)
+    final = date_list[-1].date() <= date.today() - timedelta(days=station_store.STORE_FINAL_AFTER_DAYS)
+    if len(date_list) == 1:
+        return "day", date_list[0].strftime("%Y-%m-%d"), final
+    return "month", date_list[0].strftime("%Y-%m"), final
+
+
+def _compute(date_input, variables, islands, period, period_key):
+    wide = station_data.get_station_data(date_input, variables, islands)
+    rows = []
+    for variable in variables:
+        values = wide[["island", "station_id", variable]].dropna(subset=[variable])
+        grouped = values.groupby("island")[variable]
+        stats = pd.DataFrame({
+            "count": grouped.count(),
+            "stations": values.groupby("island")["station_id"].nunique(),
+            "min": grouped.min(),
+            "max": grouped.max(),
+            "mean": grouped.mean(),
+            "median": grouped.median(),
+            "p90": grouped.quantile(0.9),
+            "sum": grouped.sum(),
+        })
+        for island in islands:
+            row = stats.loc[island] if island in stats.index else pd.Series({"count": 0, "stations": 0})
+            rows.append({
+                "island": island, "variable": variable, "period": period, "date": period_key,
+                **{statistic: int(row[statistic]) for statistic in _COUNT_STATISTICS},
+                **{statistic: float(row.get(statistic, np.nan))
+                   for statistic in STATISTICS if statistic not in _COUNT_STATISTICS},
+            })
+    return pd.DataFrame(rows, columns=_KEY_COLUMNS + STATISTICS)
+
+
+def _read(variables, islands, period, period_key):
+    with _connect() as conn:
+        return pd.read_sql_query(
+            f"SELECT * FROM island_aggregates WHERE period = ? AND date = ? "
+            f"AND island IN ({', '.join('?' * len(islands))}) "
+            f"AND variable IN ({', '.join('?' * len(variables))})",
+            conn,
+            params=[period, period_key, *islands, *variables],
+        )
+
+
+def _write(frame):
+    with sqlite_cache.write_lock, _connect() as conn:
+        conn.executemany(
+            f"INSERT OR REPLACE INTO island_aggregates ({', '.join(_KEY_COLUMNS + STATISTICS)}) "
+            f"VALUES ({', '.join('?' * (len(_KEY_COLUMNS) + len(STATISTICS)))})",
+            # NaN statistics are stored as NULL
+            [tuple(None if pd.isna(v) else v for v in row) for row in frame.itertuples(index=False)],
+        )
+
+
+def _connect():
+    return sqlite_cache.connect(AGGREGATES_PATH, _create_schema)
+
+
+def _create_schema(conn):
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS island_aggregates ("
+        "island TEXT NOT NULL, variable TEXT NOT NULL, "
+        "period TEXT NOT NULL, date TEXT NOT NULL, count INTEGER NOT NULL, stations INTEGER NOT NULL, "
+        "min REAL, max REAL, mean REAL, median REAL, p90 REAL, sum REAL, "
+        f"PRIMARY KEY ({', '.join(_KEY_COLUMNS)}))"
+    )
@@ -0,0 +1,62 @@
+"""
+Island bounding polygons and name matching shared by station_data.py,
+hcdp_client.py (the station -> island index) and island_aggregates.py.
+
+The polygons are built (and prepared) once at import time, and
+assign_islands() classifies whole NumPy lat/lon arrays with shapely's
+vectorized contains_xy, instead of building a Point per station row and
+testing it against every polygon in a Python loop.
+"""
+
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
+
+# Define all island polygons. Some boxes overlap (e.g. Maui/Molokai/
+# Kahoolawe), so order matters: the first polygon containing a point wins.
+ISLAND_POLYGONS = {
+    "Hawaii (Big Island)": Polygon([(-156.1, 18.9), (-154.7, 18.9), (-154.7, 20.3), (-156.1, 20.3)]),
+    "Maui": Polygon([(-156.8, 20.5), (-156.2, 20.5), (-156.2, 21.0), (-156.8, 21.0)]),
+    "Oahu": Polygon([(-158.3, 21.2), (-157.6, 21.2), (-157.6, 21.8), (-158.3, 21.8)]),
+    "Kauai": Polygon([(-159.8, 21.8), (-159.2, 21.8), (-159.2, 22.3), (-159.8, 22.3)]),
+    "Molokai": Polygon([(-157.4, 20.5), (-156.7, 20.5), (-156.7, 21.2), (-157.4, 21.2)]),
+    "Lānai": Polygon([(-157.1, 20.7), (-156.8, 20.7), (-156.8, 21.0), (-157.1, 21.0)]),
+    "Niihau": Polygon([(-160.3, 21.8), (-160.0, 21.8), (-160.0, 22.0), (-160.3, 22.0)]),
+    "Kahoolawe": Polygon([(-156.7, 20.5), (-156.5, 20.5), (-156.5, 20.7), (-156.7, 20.7)])
+}
+
+UNKNOWN_ISLAND = "Unknown or offshore"
+
+for _polygon in ISLAND_POLYGONS.values():
+    shapely.prepare(_polygon)
+
+# Index i -> island name, with the extra last slot for "no polygon matched"
+_ISLAND_LABELS = np.array(list(ISLAND_POLYGONS.keys()) + [UNKNOWN_ISLAND], dtype=object)
+
+
+def assign_islands(lats, lons):
+    """
+    Classifies many points at once.
+
+    lats, lons: array-likes of the same length
+    Returns a NumPy object array of island names (UNKNOWN_ISLAND where no
+    polygon contains the point).
+    """
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    labels = np.full(lats.shape, len(ISLAND_POLYGONS), dtype=np.intp)
+    # Walk the polygons in reverse so earlier ones overwrite later ones,
+    # matching the "first polygon wins" order of the original loop.
+    for index in range(len(ISLAND_POLYGONS) - 1, -1, -1):
+        polygon = ISLAND_POLYGONS[_ISLAND_LABELS[index]]
+        labels[shapely.contains_xy(polygon, lons, lats)] = index
+    return _ISLAND_LABELS[labels]
+
+
+def match_island(island_name):
+    """Maps a user-facing island name (e.g. "Lanai") onto an ISLAND_POLYGONS key."""
+    island_name = island_name.lower()
+    for name in ISLAND_POLYGONS.keys():
+        if island_name in name.lower():
+            return name
+    raise ValueError(f"Island '{island_name}' not recognized.")
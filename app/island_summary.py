@@ -0,0 +1,76 @@
+"""
+Per-island headline numbers for the General Overview page: precipitation,
+max/min temperature and humidity for the selected day or month, plus the
+change versus the previous day or month.
+
+The numbers come from island_aggregates, which computes every variable for
+every requested island with one station_data.get_station_data call per
+missing period (the current and previous periods run concurrently) and
+materializes the result, so the whole panel costs at most about one round
+of queries no matter how many islands or metrics are shown.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+import numpy as np
+import pandas as pd
+import island_aggregates
+import station_data
+
+SUMMARY_VARIABLES = ["rainfall", "max-temp", "min-temp", "humidity"]
+
+# summary column -> station_data variable
+SUMMARY_COLUMNS = {
+    "precip": "rainfall",
+    "max_temp": "max-temp",
+    "min_temp": "min-temp",
+    "humidity": "humidity",
+}
+
+
+def previous_period(date_input):
+    """The day before a "MM/DD/YYYY" input, or the month before a "MM/YYYY" one, in the same format."""
+    start = station_data.parse_date_list(date_input)[0]
+    if len(date_input) == 7:
+        return (start - timedelta(days=1)).strftime("%m/%Y")
+    return (start - timedelta(days=1)).strftime("%m/%d/%Y")
+
+
+def get_island_summaries(date_input: str, island_names: list):
+    """
+    Summarizes each island for a day or month.
+
+    Parameters:
+    - date_input (str): Either "MM/YYYY" for full month or "MM/DD/YYYY" for a specific day
+    - island_names (list): Island names (e.g., ["Oahu", "Maui", "Lanai"])
+
+    Returns:
+    - pd.DataFrame indexed by the names passed in, with columns precip (mm;
+      the average station total for a month), max_temp, min_temp (°C),
+      humidity (%), and <column>_delta: the percent change from the previous
+      period (NaN when either side is missing or zero).
+    """
+    periods = [date_input, previous_period(date_input)]
+    with ThreadPoolExecutor(max_workers=len(periods)) as pool:
+        current, previous = pool.map(lambda period: _summarize(period, island_names), periods)
+
+    summary = current.copy()
+    for column in SUMMARY_COLUMNS:
+        before = previous[column].replace(0, np.nan)
+        summary[f"{column}_delta"] = (current[column] - before) / before.abs() * 100
+    return summary
+
+
+def _summarize(date_input, island_names):
+    # Per island, read from the materialized island aggregates: the average
+    # station total rainfall (for a day, just the average reading) and the
+    # average temperature and humidity reading
+    aggregates = island_aggregates.get_island_aggregates(date_input, SUMMARY_VARIABLES, island_names)
+    aggregates = aggregates.assign(station_total=aggregates["sum"] / aggregates["stations"].replace(0, np.nan))
+    means = aggregates.pivot(index="island", columns="variable", values="mean")
+    means["rainfall"] = aggregates.pivot(index="island", columns="variable", values="station_total")["rainfall"]
+    summary = pd.DataFrame(
+        {column: means[variable] for column, variable in SUMMARY_COLUMNS.items()},
+        dtype="float64",
+    )
+    return summary.reindex(pd.Index(island_names, name="island"))
@@ -1,4 +1,5 @@
 # importing libraries
+import os
 import pandas as pd
 import numpy as np
 import streamlit as st
@@ -17,6 +18,10 @@ from vega_datasets import data
 import Predictions
 import temp
 import humidity
+import island_summary
+import island_aggregates
+import dashboard_defaults
+import hexbin
 from chat import get_chat_response
 
 # setting page configuration
@@ -82,11 +87,11 @@ metric_view = st.sidebar.radio("Select View:", ["Daily", "Monthly"], index=defau
 
 if metric_view == "Daily":
     st.sidebar.markdown("### Date")
-    st.session_state.date_input = st.sidebar.text_input("Enter Date (MM/DD/YYYY)", "12/01/2016")
+    st.session_state.date_input = st.sidebar.text_input("Enter Date (MM/DD/YYYY)", dashboard_defaults.DEFAULT_DAILY_DATE)
     elev_factor = 300
 elif metric_view == "Monthly":
     st.sidebar.markdown("### Date")
-    st.session_state.date_input = st.sidebar.text_input("Enter Date (MM/YYYY)","12/2016")
+    st.session_state.date_input = st.sidebar.text_input("Enter Date (MM/YYYY)", dashboard_defaults.DEFAULT_MONTHLY_DATE)
     elev_factor = 150
 
 # Display types that don't have a real implementation yet
@@ -99,49 +104,150 @@ def show_coming_soon(display_type):
     st.info(f"🚧 {display_type} is coming soon!")
 
 
-def plot_chart(date_input, island_name, variable):
+ALL_ISLANDS = dashboard_defaults.ALL_ISLANDS
+
+# Streamlit reruns this whole script on every widget change (even the chat
+# box), so the data loaders below are memoized with st.cache_data, which is
+# shared across user sessions. Entries expire after DATA_CACHE_TTL seconds
+# and at most DATA_CACHE_MAX_ENTRIES are kept per loader. token_present is
+# part of every key so switching between mock and live data never serves
+# the other mode's results.
+DATA_CACHE_TTL = int(os.getenv("DATA_CACHE_TTL", str(60 * 60)))
+DATA_CACHE_MAX_ENTRIES = int(os.getenv("DATA_CACHE_MAX_ENTRIES", "256"))
+
+
+def has_token():
+    return bool(os.getenv("OAUTH_TOKEN"))
+
+
+@st.cache_data(ttl=DATA_CACHE_TTL, max_entries=DATA_CACHE_MAX_ENTRIES, show_spinner=False)
+def load_station_data(date_input, island_name, variable, token_present):
+    """One island's station frame for a variable, as returned by its data module."""
+    if variable == "rainfall":
+        return data_function.get_station_data_for_period(date_input, island_name, variable)
+    if variable == "temperature":
+        return temp.get_station_data_for_period_temp(date_input, island_name, variable)
+    return humidity.get_station_data_for_period_humidity(date_input, island_name)
+
+
+@st.cache_data(ttl=DATA_CACHE_TTL, max_entries=DATA_CACHE_MAX_ENTRIES, show_spinner=False)
+def load_station_data_for_islands(date_input, island_names, variable, token_present):
+    """{island: frame} for several islands from one statewide fetch."""
+    island_names = list(island_names)
+    if variable == "rainfall":
+        return data_function.get_station_data_for_islands(date_input, island_names, variable)
+    if variable == "temperature":
+        return temp.get_station_data_for_islands_temp(date_input, island_names, variable)
+    return humidity.get_station_data_for_islands_humidity(date_input, island_names)
+
+
+@st.cache_data(ttl=DATA_CACHE_TTL, max_entries=DATA_CACHE_MAX_ENTRIES, show_spinner=False)
+def load_rainfall_forecast(month, latitude, longitude, token_present):
+    """(df_actual, df_forecast) from Predictions.build_rainfall_forecast."""
+    return Predictions.build_rainfall_forecast(month, latitude, longitude)
+
+
+@st.cache_data(ttl=DATA_CACHE_TTL, max_entries=DATA_CACHE_MAX_ENTRIES, show_spinner=False)
+def load_statewide_data(date_input, variable, token_present):
+    """Every ALL_ISLANDS station row for a variable as one frame, with an "island" column."""
+    frames = load_station_data_for_islands(date_input, tuple(ALL_ISLANDS), variable, token_present)
+    return pd.concat(
+        [frame.assign(island=name) for name, frame in frames.items()],
+        ignore_index=True,
+    )
+
+
+def show_rainfall_forecast(month, latitude, longitude):
+    Predictions.plot_actual_vs_predicted(*load_rainfall_forecast(month, latitude, longitude, has_token()))
+
+
+FLOOD_WARNING_HTML = '<div style="background-color:#34c759;padding:16px 10px;border-radius:10px;text-align:center;color:white;font-weight:bold;font-size:16px;line-height:1.4;">Flood Warning<br><span style="font-size:18px;">No</span></div>'
+FIRE_WARNING_HTML = '<div style="background-color:#ffcc00;padding:10px;border-radius:8px;text-align:center;color:black;font-weight:bold;">Fire Warning<br>Low</div>'
+
+
+@st.cache_data(ttl=DATA_CACHE_TTL, max_entries=DATA_CACHE_MAX_ENTRIES, show_spinner=False)
+def load_island_summaries(date_input, token_present):
+    """island_summary.get_island_summaries for every ALL_ISLANDS island at once."""
+    return island_summary.get_island_summaries(date_input, ALL_ISLANDS)
+
+
+@st.cache_data(ttl=DATA_CACHE_TTL, max_entries=DATA_CACHE_MAX_ENTRIES, show_spinner=False)
+def load_island_aggregates(date_input, variable, token_present):
+    """island_aggregates.get_island_aggregates for one variable and every ALL_ISLANDS island."""
+    return island_aggregates.get_island_aggregates(date_input, [variable], ALL_ISLANDS)
+
+
+def _format_metric(value, unit):
+    return "N/A" if pd.isna(value) else f"{value:.1f}{unit}"
+
+
+def _format_delta(value):
+    return None if pd.isna(value) else f"{value:.0f}%"
+
+
+def show_overview_metrics(island_name):
+    """The General Overview metric row for one island, for the selected day or month."""
+    summary = load_island_summaries(st.session_state.date_input, has_token()).loc[island_name]
+    if metric_view == "Daily":
+        labels = ["Daily Precip", "Max Temp", "Min Temp", "Humidity"]
+    else:  # monthly metrics
+        labels = ["Monthly Precip", "Avg Max Temp", "Avg Min Temp", "Avg Humidity"]
+    units = [" mm", " °C", " °C", "%"]
+
+    columns = st.columns(6)
+    for column, label, key, unit in zip(columns, labels, ["precip", "max_temp", "min_temp", "humidity"], units):
+        with column:
+            st.metric(label, _format_metric(summary[key], unit), _format_delta(summary[f"{key}_delta"]))
+    with columns[4]:
+        st.markdown(FLOOD_WARNING_HTML, unsafe_allow_html=True)
+    with columns[5]:
+        st.markdown(FIRE_WARNING_HTML, unsafe_allow_html=True)
+
+
+# Map hexagon radius in meters. With MAP_SERVER_HEXBIN=1 the station points
+# are binned here (see hexbin.py) and only one column per hexagon is sent
+# to the browser, instead of every station row for a HexagonLayer.
+HEXBIN_RADIUS_M = 500
+SERVER_SIDE_HEXBIN = os.getenv("MAP_SERVER_HEXBIN", "0") == "1"
+
+
+# Decimal places kept when map data is serialized: 5 for coordinates is
+# about a meter, far finer than a 500 m hexagon.
+MAP_COORDINATE_DECIMALS = 5
+MAP_VALUE_DECIMALS = 2
+
+
+def compact_layer_data(frame, value_columns):
+    """
+    Trims a frame to what a map layer reads (lon, lat and value_columns) and
+    rounds it before pydeck serializes it. st.pydeck_chart always sends
+    layer data as JSON records, so every extra column and digit is repeated
+    for every row.
+    """
+    compact = frame[["lon", "lat"] + value_columns].round(MAP_COORDINATE_DECIMALS)
+    compact[value_columns] = compact[value_columns].round(MAP_VALUE_DECIMALS)
+    return compact.reset_index(drop=True)
+
+
+def plot_chart(date_input, island_name, variable, server_side_hexbin=None):
     if island_name == "All" and variable == 'rainfall':
-        chart_data_1 = data_function.get_station_data_for_period(date_input, "Oahu", variable)
-        chart_data_2 = data_function.get_station_data_for_period(date_input, "Kauai", variable)
-        chart_data_3 = data_function.get_station_data_for_period(date_input, "Molokai", variable)
-        chart_data_4 = data_function.get_station_data_for_period(date_input, "Lānai", variable)
-        chart_data_5 = data_function.get_station_data_for_period(date_input, "Maui", variable)
-        chart_data_6 = data_function.get_station_data_for_period(date_input, "Hawaii (Big Island)", variable)
-        # chart_data_7 = data_function.get_station_data_for_period(date_input, "Niihau", variable)
-        # chart_data_8 = data_function.get_station_data_for_period(date_input, "Kahoolawe", variable)
-
-        chart_data = pd.concat([chart_data_1, chart_data_2, chart_data_3, chart_data_4, chart_data_5, chart_data_6], ignore_index=True)
+        # One statewide fetch split by island, rather than one fetch per island
+        chart_data = load_statewide_data(date_input, variable, has_token())
     elif island_name != "All" and variable == 'rainfall':
-        chart_data = data_function.get_station_data_for_period(date_input, island_name, variable)
+        chart_data = load_station_data(date_input, island_name, variable, has_token())
     elif island_name == "All" and variable == 'temperature':
-        chart_data_1 = temp.get_station_data_for_period_temp(date_input, "Oahu", variable)
-        chart_data_2 = temp.get_station_data_for_period_temp(date_input, "Kauai", variable)
-        chart_data_3 = temp.get_station_data_for_period_temp(date_input, "Molokai", variable)
-        chart_data_4 = temp.get_station_data_for_period_temp(date_input, "Lānai", variable)
-        chart_data_5 = temp.get_station_data_for_period_temp(date_input, "Maui", variable)
-        chart_data_6 = temp.get_station_data_for_period_temp(date_input, "Hawaii (Big Island)", variable)
-        # chart_data_7 = data_function.get_station_data_for_period(date_input, "Niihau", variable)
-        # chart_data_8 = data_function.get_station_data_for_period(date_input, "Kahoolawe", variable)
-
-        chart_data = pd.concat([chart_data_1, chart_data_2, chart_data_3, chart_data_4, chart_data_5, chart_data_6], ignore_index=True)
+        chart_data = load_statewide_data(date_input, variable, has_token())
 
         chart_data = chart_data.rename(columns={"max-temp": "max_temp"})
         value_column = "max_temp"
     elif island_name != "All" and variable == 'temperature':
-        chart_data = temp.get_station_data_for_period_temp(date_input, island_name, variable)
+        chart_data = load_station_data(date_input, island_name, variable, has_token())
         chart_data = chart_data.rename(columns={"max-temp": "max_temp"})
         value_column = "max_temp"
     elif island_name == "All" and variable == 'humidity':
-        chart_data_1 = humidity.get_station_data_for_period_humidity(date_input, "Oahu")
-        chart_data_2 = humidity.get_station_data_for_period_humidity(date_input, "Kauai")
-        chart_data_3 = humidity.get_station_data_for_period_humidity(date_input, "Molokai")
-        chart_data_4 = humidity.get_station_data_for_period_humidity(date_input, "Lānai")
-        chart_data_5 = humidity.get_station_data_for_period_humidity(date_input, "Maui")
-        chart_data_6 = humidity.get_station_data_for_period_humidity(date_input, "Hawaii (Big Island)")
-
-        chart_data = pd.concat([chart_data_1, chart_data_2, chart_data_3, chart_data_4, chart_data_5, chart_data_6], ignore_index=True)
+        chart_data = load_statewide_data(date_input, variable, has_token())
     elif island_name != "All" and variable == 'humidity':
-        chart_data = humidity.get_station_data_for_period_humidity(date_input, island_name)
+        chart_data = load_station_data(date_input, island_name, variable, has_token())
 
     # print('--------------------------')
     # print('--------------------------')
@@ -196,6 +302,45 @@ def plot_chart(date_input, island_name, variable):
         st.info(f"No {variable} data available for {island_name} on this date.")
         return
 
+    elevation_range = [np.min(chart_data[value_column]), np.max(chart_data[value_column])]
+    if server_side_hexbin is None:
+        server_side_hexbin = SERVER_SIDE_HEXBIN
+
+    if server_side_hexbin:
+        cells = hexbin.hexbin_points(chart_data["lat"], chart_data["lon"], chart_data[value_column], HEXBIN_RADIUS_M)
+        cells["elevation"] = hexbin.scale_elevation(cells["value"], elevation_range)
+        layer = pdk.Layer(
+            "ColumnLayer",
+            data=compact_layer_data(cells, ["elevation", "value"]),
+            get_position="[lon, lat]",
+            get_elevation="elevation",
+            auto_highlight=True,
+            radius=HEXBIN_RADIUS_M,
+            disk_resolution=6,
+            elevation_scale=elev_factor,
+            coverage=1,
+            pickable=True,
+            extruded=True,
+            get_fill_color=color[0],
+        )
+        tooltip_value = "{value}"
+    else:
+        layer = pdk.Layer(
+            "HexagonLayer",
+            data=compact_layer_data(chart_data, [value_column]),
+            get_position="[lon, lat]",
+            auto_highlight=True,
+            radius=HEXBIN_RADIUS_M,
+            elevation_scale=elev_factor,
+            get_elevation_weight=value_column,
+            elevation_range=elevation_range,
+            coverage=1,
+            pickable=True,
+            extruded=True,
+            color_range=color,
+        )
+        tooltip_value = "{elevationValue}"
+
     st.pydeck_chart(
         pdk.Deck(
             map_style='mapbox://styles/mapbox/satellite-v9',
@@ -205,24 +350,9 @@ def plot_chart(date_input, island_name, variable):
                 zoom=zoom,
                 pitch=50,
             ),
-            layers=[
-                pdk.Layer(
-                    "HexagonLayer",
-                    data=chart_data,
-                    get_position="[lon, lat]",
-                    auto_highlight=True,
-                    radius=500,
-                    elevation_scale=elev_factor,
-                    get_elevation_weight=value_column,
-                    elevation_range=[np.min(chart_data[value_column]), np.max(chart_data[value_column])],
-                    coverage=1,
-                    pickable=True,
-                    extruded=True,
-                    color_range=color,
-                ),
-            ],
+            layers=[layer],
             tooltip={
-                "text": f"{variable}: {{elevationValue}} {units}",
+                "text": f"{variable}: {tooltip_value} {units}",
                 "style": {
                     "backgroundColor": "#206af1",
                     "color": "white",
@@ -243,19 +373,13 @@ def island_bar_chart(date_input=st.session_state.date_input, variable="rainfall"
         "Hawaiʻi (Big Island)": "Hawaii (Big Island)"
     }
 
-    data = []
-    for label, name in islands.items():
-        if variable == "rainfall":
-            df = data_function.get_station_data_for_period(date_input, name, variable)
-            df = df.rename(columns={"rainfall": "value"})
-            agg_value = df["value"].median()
-        else:
-            df = temp.get_station_data_for_period_temp(date_input, name, variable)
-            df = df.rename(columns={"max-temp": "value"})
-            agg_value = df["value"].max()
-        data.append({"Island": label, "value": agg_value})
-
-    df_summary = pd.DataFrame(data)
+    # Read from the materialized island aggregates rather than reducing
+    # station-level rows
+    aggregates = load_island_aggregates(date_input, variable, has_token())
+    df_summary = pd.DataFrame({
+        "Island": list(islands.keys()),
+        "value": aggregates.set_index("island").loc[list(islands.values()), "median" if variable == "rainfall" else "max"].to_numpy(),
+    })
 
     bar_chart = (
         alt.Chart(df_summary)
@@ -302,8 +426,8 @@ with main_col:
             st.markdown(f'''
             # {page_title}
             ''')
-            month_pred = st.text_input("Enter Prediction Month (MM/YYYY)", "04/2025")
-            Predictions.generate_rainfall_forecast_plot(month_pred, 21.31667, -158.06667)
+            month_pred = st.text_input("Enter Prediction Month (MM/YYYY)", dashboard_defaults.DEFAULT_FORECAST_MONTH)
+            show_rainfall_forecast(month_pred, *dashboard_defaults.FORECAST_LOCATIONS[st.session_state["selected_page"]])
         else:
             st.markdown('''
             # Hawaiian Islands Overview
@@ -351,8 +475,8 @@ with main_col:
             st.markdown(f'''
             # {page_title}
             ''')
-            month_pred = st.text_input("Enter Prediction Month (MM/YYYY)", "04/2025")
-            Predictions.generate_rainfall_forecast_plot(month_pred, 21.688333, -157.952500)
+            month_pred = st.text_input("Enter Prediction Month (MM/YYYY)", dashboard_defaults.DEFAULT_FORECAST_MONTH)
+            show_rainfall_forecast(month_pred, *dashboard_defaults.FORECAST_LOCATIONS[st.session_state["selected_page"]])
         else:
             page_title = f"Weather Dashboard for Oʻahu" if st.session_state["display_type"] == "General Overview" else f"{st.session_state['display_type']} in Oʻahu"
             st.markdown(f'''
@@ -361,34 +485,7 @@ with main_col:
             ---
             ''')
             if st.session_state["display_type"] == "General Overview":
-                # Conditional Metrics Based on View
-                col1, col2, col3, col4, col5, col6 = st.columns(6)
-                if metric_view == "Daily":
-                    with col1:
-                        st.metric("Daily Precip", "3.2 mm", "10%")
-                    with col2:
-                        st.metric("Max Temp", "30.1 °C", "2%")
-                    with col3:
-                        st.metric("Min Temp", "21.7 °C", "-4%")
-                    with col4:
-                        st.metric("Humidity", "75%", "12%")
-                    with col5:
-                        st.markdown('<div style="background-color:#34c759;padding:16px 10px;border-radius:10px;text-align:center;color:white;font-weight:bold;font-size:16px;line-height:1.4;">Flood Warning<br><span style="font-size:18px;">No</span></div>', unsafe_allow_html=True)
-                    with col6:
-                        st.markdown('<div style="background-color:#ffcc00;padding:10px;border-radius:8px;text-align:center;color:black;font-weight:bold;">Fire Warning<br>Low</div>', unsafe_allow_html=True)
-                else:  # monthly metrics
-                    with col1:
-                        st.metric("Monthly Precip", "85 mm", "13%")
-                    with col2:
-                        st.metric("Avg Max Temp", "29.5 °C", "5%")
-                    with col3:
-                        st.metric("Avg Min Temp", "22.3 °C", "10%")
-                    with col4:
-                        st.metric("Avg Humidity", "77%", "11%")
-                    with col5:
-                        st.markdown('<div style="background-color:#34c759;padding:16px 10px;border-radius:10px;text-align:center;color:white;font-weight:bold;font-size:16px;line-height:1.4;">Flood Warning<br><span style="font-size:18px;">No</span></div>', unsafe_allow_html=True)
-                    with col6:
-                        st.markdown('<div style="background-color:#ffcc00;padding:10px;border-radius:8px;text-align:center;color:black;font-weight:bold;">Fire Warning<br>Low</div>', unsafe_allow_html=True)
+                show_overview_metrics("Oahu")
                 st.pydeck_chart(
                     pdk.Deck(
                         map_style='mapbox://styles/mapbox/satellite-v9',
@@ -416,8 +513,8 @@ with main_col:
             st.markdown(f'''
             # {page_title}
             ''')
-            month_pred = st.text_input("Enter Prediction Month (MM/YYYY)", "04/2025")
-            Predictions.generate_rainfall_forecast_plot(month_pred, 21.981570, -159.342206)
+            month_pred = st.text_input("Enter Prediction Month (MM/YYYY)", dashboard_defaults.DEFAULT_FORECAST_MONTH)
+            show_rainfall_forecast(month_pred, *dashboard_defaults.FORECAST_LOCATIONS[st.session_state["selected_page"]])
         else:
             page_title = f"Weather Dashboard for Kauaʻi" if st.session_state["display_type"] == "General Overview" else f"{st.session_state['display_type']} in Kauaʻi"
             st.markdown(f'''
@@ -426,34 +523,7 @@ with main_col:
             ---
             ''')
             if st.session_state["display_type"] == "General Overview":
-                # Conditional Metrics Based on View
-                col1, col2, col3, col4, col5, col6 = st.columns(6)
-                if metric_view == "Daily":
-                    with col1:
-                        st.metric("Daily Precip", "3.2 mm","10%")
-                    with col2:
-                        st.metric("Max Temp", "30.1 °C","2%")
-                    with col3:
-                        st.metric("Min Temp", "21.7 °C","-4%")
-                    with col4:
-                        st.metric("Humidity", "75%","12%")
-                    with col5:
-                        st.markdown('<div style="background-color:#34c759;padding:16px 10px;border-radius:10px;text-align:center;color:white;font-weight:bold;font-size:16px;line-height:1.4;">Flood Warning<br><span style="font-size:18px;">No</span></div>', unsafe_allow_html=True)
-                    with col6:
-                        st.markdown('<div style="background-color:#ffcc00;padding:10px;border-radius:8px;text-align:center;color:black;font-weight:bold;">Fire Warning<br>Low</div>', unsafe_allow_html=True)
-                else:
-                    with col1:
-                        st.metric("Monthly Precip", "85 mm","13%")
-                    with col2:
-                        st.metric("Avg Max Temp", "29.5 °C","5%")
-                    with col3:
-                        st.metric("Avg Min Temp", "22.3 °C","10%")
-                    with col4:
-                        st.metric("Avg Humidity", "77%","11%")
-                    with col5:
-                        st.markdown('<div style="background-color:#34c759;padding:16px 10px;border-radius:10px;text-align:center;color:white;font-weight:bold;font-size:16px;line-height:1.4;">Flood Warning<br><span style="font-size:18px;">No</span></div>', unsafe_allow_html=True)
-                    with col6:
-                        st.markdown('<div style="background-color:#ffcc00;padding:10px;border-radius:8px;text-align:center;color:black;font-weight:bold;">Fire Warning<br>Low</div>', unsafe_allow_html=True)
+                show_overview_metrics("Kauai")
                 st.pydeck_chart(
                     pdk.Deck(
                         map_style='mapbox://styles/mapbox/satellite-v9',
@@ -481,8 +551,8 @@ with main_col:
             st.markdown(f'''
             # {page_title}
             ''')
-            month_pred = st.text_input("Enter Prediction Month (MM/YYYY)", "04/2025")
-            Predictions.generate_rainfall_forecast_plot(month_pred, 21.31667, -158.06667)
+            month_pred = st.text_input("Enter Prediction Month (MM/YYYY)", dashboard_defaults.DEFAULT_FORECAST_MONTH)
+            show_rainfall_forecast(month_pred, *dashboard_defaults.FORECAST_LOCATIONS[st.session_state["selected_page"]])
         else:
             page_title = f"Weather Dashboard for Molokaʻi" if st.session_state["display_type"] == "General Overview" else f"{st.session_state['display_type']} in Molokaʻi"
             st.markdown(f'''
@@ -491,34 +561,7 @@ with main_col:
             ---
             ''')
             if st.session_state["display_type"] == "General Overview":
-                # Conditional Metrics Based on View
-                col1, col2, col3, col4, col5, col6 = st.columns(6)
-                if metric_view == "Daily":
-                    with col1:
-                        st.metric("Daily Precip", "3.2 mm","10%")
-                    with col2:
-                        st.metric("Max Temp", "30.1 °C","2%")
-                    with col3:
-                        st.metric("Min Temp", "21.7 °C","-4%")
-                    with col4:
-                        st.metric("Humidity", "75%","12%")
-                    with col5:
-                        st.markdown('<div style="background-color:#34c759;padding:16px 10px;border-radius:10px;text-align:center;color:white;font-weight:bold;font-size:16px;line-height:1.4;">Flood Warning<br><span style="font-size:18px;">No</span></div>', unsafe_allow_html=True)
-                    with col6:
-                        st.markdown('<div style="background-color:#ffcc00;padding:10px;border-radius:8px;text-align:center;color:black;font-weight:bold;">Fire Warning<br>Low</div>', unsafe_allow_html=True)
-                else:
-                    with col1:
-                        st.metric("Monthly Precip", "85 mm","13%")
-                    with col2:
-                        st.metric("Avg Max Temp", "29.5 °C","5%")
-                    with col3:
-                        st.metric("Avg Min Temp", "22.3 °C","10%")
-                    with col4:
-                        st.metric("Avg Humidity", "77%","11%")
-                    with col5:
-                        st.markdown('<div style="background-color:#34c759;padding:16px 10px;border-radius:10px;text-align:center;color:white;font-weight:bold;font-size:16px;line-height:1.4;">Flood Warning<br><span style="font-size:18px;">No</span></div>', unsafe_allow_html=True)
-                    with col6:
-                        st.markdown('<div style="background-color:#ffcc00;padding:10px;border-radius:8px;text-align:center;color:black;font-weight:bold;">Fire Warning<br>Low</div>', unsafe_allow_html=True)
+                show_overview_metrics("Molokai")
                 st.pydeck_chart(
                     pdk.Deck(
                         map_style='mapbox://styles/mapbox/satellite-v9',
@@ -546,8 +589,8 @@ with main_col:
             st.markdown(f'''
             # {page_title}
             ''')
-            month_pred = st.text_input("Enter Prediction Month (MM/YYYY)", "04/2025")
-            Predictions.generate_rainfall_forecast_plot(month_pred, 21.31667, -158.06667)
+            month_pred = st.text_input("Enter Prediction Month (MM/YYYY)", dashboard_defaults.DEFAULT_FORECAST_MONTH)
+            show_rainfall_forecast(month_pred, *dashboard_defaults.FORECAST_LOCATIONS[st.session_state["selected_page"]])
         else:
             page_title = f"Weather Dashboard for Lānaʻi" if st.session_state["display_type"] == "General Overview" else f"{st.session_state['display_type']} in Lānaʻi"
             st.markdown(f'''
@@ -556,34 +599,7 @@ with main_col:
             ---
             ''')
             if st.session_state["display_type"] == "General Overview":
-                # Conditional Metrics Based on View
-                col1, col2, col3, col4, col5, col6 = st.columns(6)
-                if metric_view == "Daily":
-                    with col1:
-                        st.metric("Daily Precip", "3.2 mm","10%")
-                    with col2:
-                        st.metric("Max Temp", "30.1 °C","2%")
-                    with col3:
-                        st.metric("Min Temp", "21.7 °C","-4%")
-                    with col4:
-                        st.metric("Humidity", "75%","12%")
-                    with col5:
-                        st.markdown('<div style="background-color:#34c759;padding:16px 10px;border-radius:10px;text-align:center;color:white;font-weight:bold;font-size:16px;line-height:1.4;">Flood Warning<br><span style="font-size:18px;">No</span></div>', unsafe_allow_html=True)
-                    with col6:
-                        st.markdown('<div style="background-color:#ffcc00;padding:10px;border-radius:8px;text-align:center;color:black;font-weight:bold;">Fire Warning<br>Low</div>', unsafe_allow_html=True)
-                else:
-                    with col1:
-                        st.metric("Monthly Precip", "85 mm","13%")
-                    with col2:
-                        st.metric("Avg Max Temp", "29.5 °C","5%")
-                    with col3:
-                        st.metric("Avg Min Temp", "22.3 °C","10%")
-                    with col4:
-                        st.metric("Avg Humidity", "77%","11%")
-                    with col5:
-                        st.markdown('<div style="background-color:#34c759;padding:16px 10px;border-radius:10px;text-align:center;color:white;font-weight:bold;font-size:16px;line-height:1.4;">Flood Warning<br><span style="font-size:18px;">No</span></div>', unsafe_allow_html=True)
-                    with col6:
-                        st.markdown('<div style="background-color:#ffcc00;padding:10px;border-radius:8px;text-align:center;color:black;font-weight:bold;">Fire Warning<br>Low</div>', unsafe_allow_html=True)
+                show_overview_metrics("Lānai")
                 st.pydeck_chart(
                     pdk.Deck(
                         map_style='mapbox://styles/mapbox/satellite-v9',
@@ -612,8 +628,8 @@ with main_col:
             st.markdown(f'''
             # {page_title}
             ''')
-            month_pred = st.text_input("Enter Prediction Month (MM/YYYY)", "04/2025")
-            Predictions.generate_rainfall_forecast_plot(month_pred, 21.31667, -158.06667)
+            month_pred = st.text_input("Enter Prediction Month (MM/YYYY)", dashboard_defaults.DEFAULT_FORECAST_MONTH)
+            show_rainfall_forecast(month_pred, *dashboard_defaults.FORECAST_LOCATIONS[st.session_state["selected_page"]])
         else:
             page_title = f"Weather Dashboard for Maui" if st.session_state["display_type"] == "General Overview" else f"{st.session_state['display_type']} in Maui"
             st.markdown(f'''
@@ -622,34 +638,7 @@ with main_col:
             ---
             ''')
             if st.session_state["display_type"] == "General Overview":
-                # Conditional Metrics Based on View
-                col1, col2, col3, col4, col5, col6 = st.columns(6)
-                if metric_view == "Daily":   
-                    with col1:
-                        st.metric("Daily Precip", "3.2 mm","10%")
-                    with col2:
-                        st.metric("Max Temp", "30.1 °C","2%")
-                    with col3:
-                        st.metric("Min Temp", "21.7 °C","-4%")
-                    with col4:
-                        st.metric("Humidity", "75%","12%")
-                    with col5:
-                        st.markdown('<div style="background-color:#34c759;padding:16px 10px;border-radius:10px;text-align:center;color:white;font-weight:bold;font-size:16px;line-height:1.4;">Flood Warning<br><span style="font-size:18px;">No</span></div>', unsafe_allow_html=True)
-                    with col6:
-                        st.markdown('<div style="background-color:#ffcc00;padding:10px;border-radius:8px;text-align:center;color:black;font-weight:bold;">Fire Warning<br>Low</div>', unsafe_allow_html=True)
-                else:
-                    with col1:
-                        st.metric("Monthly Precip", "85 mm","13%")
-                    with col2:
-                        st.metric("Avg Max Temp", "29.5 °C","5%")
-                    with col3:
-                        st.metric("Avg Min Temp", "22.3 °C","10%")
-                    with col4:
-                        st.metric("Avg Humidity", "77%","11%")
-                    with col5:
-                        st.markdown('<div style="background-color:#34c759;padding:16px 10px;border-radius:10px;text-align:center;color:white;font-weight:bold;font-size:16px;line-height:1.4;">Flood Warning<br><span style="font-size:18px;">No</span></div>', unsafe_allow_html=True)
-                    with col6:
-                        st.markdown('<div style="background-color:#ffcc00;padding:10px;border-radius:8px;text-align:center;color:black;font-weight:bold;">Fire Warning<br>Low</div>', unsafe_allow_html=True)
+                show_overview_metrics("Maui")
                 st.pydeck_chart(
                     pdk.Deck(
                         map_style='mapbox://styles/mapbox/satellite-v9',
@@ -677,8 +666,8 @@ with main_col:
             st.markdown(f'''
             # {page_title}
             ''')
-            month_pred = st.text_input("Enter Prediction Month (MM/YYYY)", "04/2025")
-            Predictions.generate_rainfall_forecast_plot(month_pred, 19.83639, -155.613)
+            month_pred = st.text_input("Enter Prediction Month (MM/YYYY)", dashboard_defaults.DEFAULT_FORECAST_MONTH)
+            show_rainfall_forecast(month_pred, *dashboard_defaults.FORECAST_LOCATIONS[st.session_state["selected_page"]])
         else:
             page_title = f"Weather Dashboard for Hawaiʻi (Big Island)" if st.session_state["display_type"] == "General Overview" else f"{st.session_state['display_type']} in Hawaiʻi (Big Island)"
             st.markdown(f'''
@@ -687,34 +676,7 @@ with main_col:
             ---
             ''')
             if st.session_state["display_type"] == "General Overview":
-                # Conditional Metrics Based on View
-                col1, col2, col3, col4, col5, col6 = st.columns(6)
-                if metric_view == "Daily":   
-                    with col1:
-                        st.metric("Daily Precip", "3.2 mm","10%")
-                    with col2:
-                        st.metric("Max Temp", "30.1 °C","2%")
-                    with col3:
-                        st.metric("Min Temp", "21.7 °C","-4%")
-                    with col4:
-                        st.metric("Humidity", "75%","12%")
-                    with col5:
-                        st.markdown('<div style="background-color:#34c759;padding:16px 10px;border-radius:10px;text-align:center;color:white;font-weight:bold;font-size:16px;line-height:1.4;">Flood Warning<br><span style="font-size:18px;">No</span></div>', unsafe_allow_html=True)
-                    with col6:
-                        st.markdown('<div style="background-color:#ffcc00;padding:10px;border-radius:8px;text-align:center;color:black;font-weight:bold;">Fire Warning<br>Low</div>', unsafe_allow_html=True)
-                else:
-                    with col1:
-                        st.metric("Monthly Precip", "85 mm","13%")
-                    with col2:
-                        st.metric("Avg Max Temp", "29.5 °C","5%")
-                    with col3:
-                        st.metric("Avg Min Temp", "22.3 °C","10%")
-                    with col4:
-                        st.metric("Avg Humidity", "77%","11%")
-                    with col5:
-                        st.markdown('<div style="background-color:#34c759;padding:16px 10px;border-radius:10px;text-align:center;color:white;font-weight:bold;font-size:16px;line-height:1.4;">Flood Warning<br><span style="font-size:18px;">No</span></div>', unsafe_allow_html=True)
-                    with col6:
-                        st.markdown('<div style="background-color:#ffcc00;padding:10px;border-radius:8px;text-align:center;color:black;font-weight:bold;">Fire Warning<br>Low</div>', unsafe_allow_html=True)
+                show_overview_metrics("Hawaii (Big Island)")
                 st.pydeck_chart(
                     pdk.Deck(
                         map_style='mapbox://styles/mapbox/satellite-v9',
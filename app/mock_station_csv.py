@@ -14,11 +14,24 @@ Expected files live in hi-climate-backend/mock_data, named like:
   temperature_min_month_statewide_partial_station_data_2026.csv
   relative_humidity_day_statewide_partial_station_data_2026_04.csv
   (no relative_humidity monthly file)
+
+Running this module (python app/mock_station_csv.py) converts each CSV into
+a columnar copy next to it (<name>.columns/, one .npy file per column plus
+a station-by-date value block). When an up-to-date copy exists it is opened
+memory-mapped, so a single-day lookup only reads the LAT, LON, Island and
+that one date's values instead of text-parsing every column.
 """
 
+import glob
+import hashlib
+import json
 import os
+import shutil
+import threading
 from datetime import datetime
+import numpy as np
 import pandas as pd
+import station_index
 
 _APP_DIR = os.path.dirname(os.path.abspath(__file__))
 MOCK_DATA_DIR = os.path.normpath(
@@ -39,6 +52,15 @@ ISLAND_CODES = {
 }
 
 
+# path -> (mtime, parsed DataFrame); see _read_csv_frame()
+_frames = {}
+# columnar dir -> memory-mapped store; see _open_columnar()
+_columnar = {}
+# day file path -> (file versions, station_index index); see _station_directory_index()
+_station_indexes = {}
+_frames_lock = threading.Lock()
+
+
 def available_month(requested_month: int) -> int:
     """Maps an arbitrary requested month (1-12) onto the available 1-7 range."""
     return ((requested_month - 1) % _AVAILABLE_MONTHS) + 1
@@ -52,6 +74,150 @@ def _month_file(prefix):
     return os.path.join(MOCK_DATA_DIR, f"{prefix}_month_statewide_partial_station_data_2026.csv")
 
 
+def _load_frame(path, columns=None):
+    """
+    Returns the mock data at path as a DataFrame indexed by Island/SKN,
+    with float64 LAT/LON/value columns, or None if it doesn't exist.
+
+    columns: the date columns needed (None for all of them); LAT/LON are
+    always included and requested columns the file doesn't have are left
+    out. With an up-to-date columnar copy (see convert_to_columnar()) only
+    those columns are read; otherwise this falls back to the parsed CSV.
+    The returned frame may be shared: callers must not modify it in place.
+    """
+    store = _open_columnar(path)
+    if store is not None:
+        return _columnar_frame(store, columns)
+
+    df = _read_csv_frame(path)
+    if df is None or columns is None:
+        return df
+    return df[["LAT", "LON"] + [c for c in columns if c in df.columns]]
+
+
+def _read_csv_frame(path):
+    """
+    Each CSV is parsed once and kept in memory until its mtime changes, so
+    repeated renders don't pay pd.read_csv again.
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    with _frames_lock:
+        cached = _frames.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    df = pd.read_csv(path, dtype={"Island": str})
+    value_cols = ["LAT", "LON"] + [c for c in df.columns if c.startswith("X")]
+    df[value_cols] = df[value_cols].astype("float64")
+    df = df.set_index(["Island", "SKN"]).sort_index()
+    with _frames_lock:
+        _frames[path] = (mtime, df)
+    return df
+
+
+def _columnar_dir(path):
+    return os.path.splitext(path)[0] + ".columns"
+
+
+def _open_columnar(path):
+    """
+    Returns the memory-mapped columnar copy of path, or None if there isn't
+    one or the CSV has been modified since it was converted.
+    """
+    col_dir = _columnar_dir(path)
+    manifest_path = os.path.join(col_dir, "columns.json")
+    try:
+        manifest_mtime = os.path.getmtime(manifest_path)
+    except OSError:
+        return None
+
+    with _frames_lock:
+        store = _columnar.get(col_dir)
+    if not store or store["manifest_mtime"] != manifest_mtime:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        store = {
+            "manifest_mtime": manifest_mtime,
+            "source_mtime": manifest["source_mtime"],
+            "columns": {name: i for i, name in enumerate(manifest["columns"])},
+            "index": pd.MultiIndex.from_arrays(
+                [np.load(os.path.join(col_dir, "Island.npy")), np.load(os.path.join(col_dir, "SKN.npy"))],
+                names=["Island", "SKN"],
+            ),
+            "lat": np.load(os.path.join(col_dir, "LAT.npy"), mmap_mode="r"),
+            "lon": np.load(os.path.join(col_dir, "LON.npy"), mmap_mode="r"),
+            # (date, station) block: each date's values are one contiguous row
+            "values": np.load(os.path.join(col_dir, "values.npy"), mmap_mode="r"),
+        }
+        with _frames_lock:
+            _columnar[col_dir] = store
+
+    try:
+        if os.path.getmtime(path) != store["source_mtime"]:
+            return None
+    except OSError:
+        pass  # Only the columnar copy was shipped, which is fine
+    return store
+
+
+def _columnar_frame(store, columns):
+    names = list(store["columns"]) if columns is None else [c for c in columns if c in store["columns"]]
+    # Fancy-indexing the memmap only pages in the requested dates' rows
+    rows = store["values"][[store["columns"][name] for name in names]]
+    data = {"LAT": np.asarray(store["lat"]), "LON": np.asarray(store["lon"])}
+    data.update(zip(names, rows))
+    return pd.DataFrame(data, index=store["index"])
+
+
+def convert_to_columnar(path):
+    """
+    Writes the columnar copy of one mock CSV to <name>.columns/ next to it:
+    Island.npy, SKN.npy, LAT.npy, LON.npy, a float64 values.npy block
+    shaped (date, station), and a columns.json manifest listing the date
+    columns and the source CSV's mtime (used to detect stale copies).
+    """
+    df = _read_csv_frame(path)
+    if df is None:
+        raise FileNotFoundError(path)
+    date_cols = [c for c in df.columns if c.startswith("X")]
+    skn = df.index.get_level_values("SKN").to_numpy()
+    if skn.dtype == object:
+        skn = skn.astype(str)
+
+    col_dir = _columnar_dir(path)
+    tmp_dir = f"{col_dir}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    np.save(os.path.join(tmp_dir, "Island.npy"), df.index.get_level_values("Island").fillna("").to_numpy(dtype=str))
+    np.save(os.path.join(tmp_dir, "SKN.npy"), skn)
+    np.save(os.path.join(tmp_dir, "LAT.npy"), df["LAT"].to_numpy())
+    np.save(os.path.join(tmp_dir, "LON.npy"), df["LON"].to_numpy())
+    np.save(os.path.join(tmp_dir, "values.npy"), np.ascontiguousarray(df[date_cols].to_numpy(dtype="float64").T))
+    with open(os.path.join(tmp_dir, "columns.json"), "w", encoding="utf-8") as f:
+        json.dump({"source_mtime": os.path.getmtime(path), "columns": date_cols}, f)
+
+    shutil.rmtree(col_dir, ignore_errors=True)
+    os.replace(tmp_dir, col_dir)
+    return col_dir
+
+
+def convert_mock_data(mock_data_dir=MOCK_DATA_DIR):
+    """Converts every mock CSV in mock_data_dir; returns the written directories."""
+    paths = sorted(glob.glob(os.path.join(mock_data_dir, "*_statewide_partial_station_data_*.csv")))
+    return [convert_to_columnar(path) for path in paths]
+
+
+def _island_rows(df, island_code):
+    """One island's rows of a _load_frame() frame (indexed by SKN), or an empty frame."""
+    try:
+        return df.loc[island_code]
+    except KeyError:
+        return df.iloc[0:0].droplevel("Island")
+
+
 def load_station_values(prefix, matched_island, month, day=None):
     """
     Loads real station lat/lon/value rows for one island for a given metric.
@@ -65,13 +231,23 @@ def load_station_values(prefix, matched_island, month, day=None):
          averaging the daily file across the month if no monthly file
          exists for this metric, e.g. humidity).
 
-    Returns a list of {"lat": float, "lon": float, "value": float} dicts,
-    one per station with a non-missing reading. Returns [] if the
-    corresponding mock file/column/island isn't available.
+    Returns a DataFrame with columns skn (the station's SKN) and float lat,
+    lon, value - one row per station with a non-missing reading. It is empty (but still has those
+    columns) if the corresponding mock file/column/island isn't available.
+    """
+    return load_station_values_for_islands(prefix, [matched_island], month, day=day)[matched_island]
+
+
+def load_station_values_for_islands(prefix, matched_islands, month, day=None):
     """
-    island_code = ISLAND_CODES.get(matched_island)
-    if not island_code:
-        return []
+    Same as load_station_values, but for several islands at once: the
+    statewide file is read a single time and split by its Island column,
+    instead of being re-read once per island.
+
+    Returns {matched_island: DataFrame(skn, lat, lon, value)} with an entry
+    (possibly empty) for every island passed in.
+    """
+    island_codes = {island: ISLAND_CODES.get(island) for island in matched_islands}
 
     if day is not None:
         # Clamp so callers can pass any day-of-month (29-31 don't exist in
@@ -79,48 +255,103 @@ def load_station_values(prefix, matched_island, month, day=None):
         day = min(day, 28)
         path = _day_file(prefix, month)
         col = f"X2026.{month:02d}.{day:02d}"
-        return _read_column(path, island_code, col)
+        return _read_column(path, island_codes, col)
 
     month_path = _month_file(prefix)
     col = f"X2026.{month:02d}"
-    if os.path.exists(month_path):
-        records = _read_column(month_path, island_code, col)
-        if records:
-            return records
+    records = _read_column(month_path, island_codes, col)
+    missing = {island: code for island, code in island_codes.items() if code and records[island].empty}
+    if not missing:
+        return records
 
     # No monthly file for this metric (e.g. humidity) - average the days instead
-    day_path = _day_file(prefix, month)
-    if not os.path.exists(day_path):
-        return []
-    df = pd.read_csv(day_path)
+    df = _load_frame(_day_file(prefix, month))
+    if df is None:
+        return records
     date_cols = [c for c in df.columns if c.startswith(f"X2026.{month:02d}.")]
     if not date_cols:
-        return []
-    subset = df[df["Island"] == island_code][["LAT", "LON"] + date_cols]
-    records = []
-    for _, row in subset.iterrows():
-        values = row[date_cols].dropna()
-        if len(values) == 0:
-            continue
-        records.append({"lat": float(row["LAT"]), "lon": float(row["LON"]), "value": float(values.mean())})
+        return records
+    for island, island_code in missing.items():
+        subset = _island_rows(df, island_code)
+        block = subset[date_cols].to_numpy()
+        # Skip stations with no readings at all this month (nanmean of an
+        # all-NaN row would just warn and return NaN)
+        has_values = (~np.isnan(block)).any(axis=1)
+        records[island] = _station_values(
+            subset.index.to_numpy()[has_values],
+            subset["LAT"].to_numpy()[has_values],
+            subset["LON"].to_numpy()[has_values],
+            np.nanmean(block[has_values], axis=1),
+        )
     return records
 
 
 def find_nearest_station(prefix, latitude, longitude):
     """
     Finds the real mock station (statewide, any island) closest to the
-    given lat/lon, using month 1's daily file as the station directory.
+    given lat/lon (great-circle distance), using month 1's daily file as the
+    station directory.
 
     Returns the station's SKN identifier, or None if no mock data exists.
     """
-    path = _day_file(prefix, 1)
-    if not os.path.exists(path):
-        return None
-    df = pd.read_csv(path).dropna(subset=["LAT", "LON"])
-    if df.empty:
+    return station_index.nearest_station(_station_directory_index(prefix), latitude, longitude)
+
+
+def find_nearest_stations(prefix, latitudes, longitudes, k=1):
+    """
+    Batched version of find_nearest_station: returns (skns, distances_km),
+    each shaped (n_points, k), or None if no mock data exists.
+    """
+    index = _station_directory_index(prefix)
+    if index is None:
         return None
-    dist = (df["LAT"] - latitude) ** 2 + (df["LON"] - longitude) ** 2
-    return df.loc[dist.idxmin(), "SKN"]
+    return station_index.nearest_stations(index, latitudes, longitudes, k=k)
+
+
+def _station_directory_index(prefix):
+    """
+    Nearest-station index over month 1's daily file, rebuilt only when that
+    file (or its columnar copy) changes.
+    """
+    path = _day_file(prefix, 1)
+    version = tuple(
+        os.path.getmtime(p) if os.path.exists(p) else None
+        for p in (path, os.path.join(_columnar_dir(path), "columns.json"))
+    )
+    with _frames_lock:
+        cached = _station_indexes.get(path)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    df = _load_frame(path, columns=[])
+    index = None
+    if df is not None:
+        df = df.dropna(subset=["LAT", "LON"])
+        index = station_index.build_station_index(
+            df.index.get_level_values("SKN").to_numpy(), df["LAT"].to_numpy(), df["LON"].to_numpy()
+        )
+    with _frames_lock:
+        _station_indexes[path] = (version, index)
+    return index
+
+
+def daily_data_version(prefix):
+    """
+    Returns a string that changes whenever one of the daily files
+    load_station_daily_series() reads for prefix changes (the CSV, or its
+    columnar copy when only that was shipped), for keying anything derived
+    from them.
+    """
+    mtimes = []
+    for month in range(1, _AVAILABLE_MONTHS + 1):
+        path = _day_file(prefix, month)
+        for candidate in (path, os.path.join(_columnar_dir(path), "columns.json")):
+            if os.path.exists(candidate):
+                mtimes.append(os.path.getmtime(candidate))
+                break
+        else:
+            mtimes.append(0)
+    return hashlib.sha1(repr(mtimes).encode()).hexdigest()[:12]
 
 
 def load_station_daily_series(prefix, skn):
@@ -132,14 +363,13 @@ def load_station_daily_series(prefix, skn):
     """
     records = []
     for month in range(1, _AVAILABLE_MONTHS + 1):
-        path = _day_file(prefix, month)
-        if not os.path.exists(path):
+        df = _load_frame(_day_file(prefix, month))
+        if df is None:
             continue
-        df = pd.read_csv(path)
-        row = df[df["SKN"] == skn]
-        if row.empty:
+        try:
+            row = df.xs(skn, level="SKN").iloc[0]
+        except KeyError:
             continue
-        row = row.iloc[0]
         date_cols = [c for c in df.columns if c.startswith(f"X2026.{month:02d}.")]
         for col in date_cols:
             value = row[col]
@@ -151,14 +381,27 @@ def load_station_daily_series(prefix, skn):
     return records
 
 
-def _read_column(path, island_code, col):
-    if not os.path.exists(path):
-        return []
-    df = pd.read_csv(path)
-    if col not in df.columns:
-        return []
-    subset = df[df["Island"] == island_code][["LAT", "LON", col]].dropna()
-    return [
-        {"lat": float(row["LAT"]), "lon": float(row["LON"]), "value": float(row[col])}
-        for _, row in subset.iterrows()
-    ]
+def _station_values(skn, lat, lon, value):
+    values = pd.DataFrame({"lat": lat, "lon": lon, "value": value}, dtype="float64")
+    values.insert(0, "skn", np.asarray(skn, dtype=object))
+    return values.reset_index(drop=True)
+
+
+def _read_column(path, island_codes, col):
+    records = {island: _station_values([], [], [], []) for island in island_codes}
+    df = _load_frame(path, columns=[col])
+    if df is None or col not in df.columns:
+        return records
+    for island, island_code in island_codes.items():
+        if not island_code:
+            continue
+        subset = _island_rows(df, island_code)[["LAT", "LON", col]].dropna()
+        records[island] = _station_values(
+            subset.index.to_numpy(), subset["LAT"].to_numpy(), subset["LON"].to_numpy(), subset[col].to_numpy()
+        )
+    return records
+
+
+if __name__ == "__main__":
+    for converted in convert_mock_data():
+        print(f"Wrote {converted}")
@@ -0,0 +1,39 @@
+"""
+Connection helper shared by the SQLite caches under HCDP_CACHE_DIR
+(station_store.py and island_aggregates.py).
+
+connect() opens a file in WAL mode and runs the caller's schema function
+the first time that file is used in this process. Writers hold write_lock
+so concurrent threads don't queue up on SQLite's own file lock.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+write_lock = threading.RLock()
+
+# Paths whose schema has been created by this process
+_ready_paths = set()
+
+
+@contextmanager
+def connect(path, create_schema):
+    """
+    Yields a committed-on-exit connection to the SQLite file at path,
+    calling create_schema(conn) on first use.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        if path not in _ready_paths:
+            with write_lock:
+                conn.execute("PRAGMA journal_mode=WAL")
+                create_schema(conn)
+                conn.commit()
+                _ready_paths.add(path)
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
@@ -0,0 +1,234 @@
+"""
+Station-data engine behind data_function.py, temp.py and humidity.py.
+
+get_station_data() takes a list of variables and islands, runs each
+underlying query exactly once (HCDP through station_store, or the mock
+CSVs when no OAUTH_TOKEN is set) and returns a single wide frame, so
+asking for rainfall and temperature together costs one query per variable
+rather than one full pass per caller. The per-variable modules are thin
+wrappers that pick one column out of it.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import reduce
+import pandas as pd
+import hcdp_client
+import island_geometry
+import mock_station_csv
+import station_store
+
+# Upper bound on simultaneous HCDP queries (one per variable being
+# fetched). Overridable via HCDP_MAX_CONCURRENCY in .env.
+HCDP_MAX_CONCURRENCY = int(os.getenv("HCDP_MAX_CONCURRENCY", "8"))
+
+# variable (also its output column) -> HCDP value filters (None: no live
+# path yet) and mock_station_csv file prefix (None: no mock data)
+VARIABLES = {
+    "rainfall": {
+        "query": {"datatype": "rainfall", "production": "new", "period": "day"},
+        "mock_prefix": "rainfall_new",
+    },
+    "max-temp": {
+        "query": {"datatype": "temperature", "aggregation": "max", "period": "day"},
+        "mock_prefix": "temperature_max",
+    },
+    "min-temp": {
+        "query": {"datatype": "temperature", "aggregation": "min", "period": "day"},
+        "mock_prefix": "temperature_min",
+    },
+    "mean-temp": {
+        "query": {"datatype": "temperature", "aggregation": "mean", "period": "day"},
+        "mock_prefix": None,
+    },
+    "humidity": {
+        "query": None,
+        "mock_prefix": "relative_humidity",
+    },
+}
+
+# Names the dashboard uses for a variable
+VARIABLE_ALIASES = {"temperature": "max-temp"}
+
+KEY_COLUMNS = ["Time", "station_id", "island", "lat", "lon"]
+
+# Per-variable frames are joined on these; island/lat/lon follow from the
+# station, and two stations can share coordinates
+MERGE_COLUMNS = ["Time", "station_id"]
+
+
+def parse_date_list(date_input):
+    """Expands "MM/YYYY" into every day of that month, or "MM/DD/YYYY" into that single day."""
+    try:
+        if len(date_input) == 7:  # MM/YYYY
+            start_date = datetime.strptime("01/" + date_input, "%d/%m/%Y")
+            end_date = (start_date.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+        elif len(date_input) == 10:  # MM/DD/YYYY
+            start_date = datetime.strptime(date_input, "%m/%d/%Y")
+            end_date = start_date
+        else:
+            raise ValueError("Date input must be in MM/YYYY or MM/DD/YYYY format.")
+    except ValueError as e:
+        raise ValueError(f"Date parsing failed: {e}")
+
+    return [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+
+
+def get_station_data(date_input: str, variables: list, island_names: list, max_concurrency: int = None):
+    """
+    Fetches station-level data for several variables and islands at once.
+
+    Parameters:
+    - date_input (str): Either "MM/YYYY" for full month or "MM/DD/YYYY" for a specific day
+    - variables (list): Keys of VARIABLES (or VARIABLE_ALIASES), e.g. ["rainfall", "max-temp"]
+    - island_names (list): Island names (e.g., ["Oahu", "Maui", "Lanai"])
+    - max_concurrency (int): Max simultaneous HCDP queries (defaults to HCDP_MAX_CONCURRENCY)
+
+    Returns:
+    - pd.DataFrame: one row per station and day, with columns Time,
+      station_id (the HCDP station id, or the mock file's SKN), island (the
+      matched ISLAND_POLYGONS name), lat, lon and one column per
+      variable (NaN where a station has no reading for it). Without an
+      OAUTH_TOKEN, Monthly view has one row per station labelled with the
+      month's first day, as the mock files hold monthly values.
+    """
+    variables = list(dict.fromkeys(VARIABLE_ALIASES.get(v, v) for v in variables))
+    unknown = [v for v in variables if v not in VARIABLES]
+    if unknown:
+        raise ValueError(f"Unknown variable(s): {', '.join(unknown)}")
+
+    hcdp_api_token = os.getenv("OAUTH_TOKEN")
+    islands = list(dict.fromkeys(island_geometry.match_island(name) for name in island_names))
+    date_list = parse_date_list(date_input)
+
+    live = [v for v in variables if variable_source(v) == "live"]
+    mock = [v for v in variables if v not in live]
+    for variable in mock:
+        if not VARIABLES[variable]["mock_prefix"]:
+            raise ValueError("OAUTH_TOKEN is not set in the .env file")
+
+    frames = [_load_mock_variable(variable, date_list, islands) for variable in mock]
+    if live:
+        frames.extend(_load_live_variables(live, date_list, islands, hcdp_api_token, max_concurrency))
+
+    # Restore the requested variable order after the mock/live split
+    frames = [frames[(mock + live).index(variable)] for variable in variables]
+    wide = reduce(_merge_variables, frames)
+    return wide[KEY_COLUMNS + variables]
+
+
+def variable_source(variable):
+    """Returns "live" if get_station_data would fetch this variable from HCDP right now, else "mock"."""
+    variable = VARIABLE_ALIASES.get(variable, variable)
+    return "live" if os.getenv("OAUTH_TOKEN") and VARIABLES[variable]["query"] else "mock"
+
+
+def split_by_island(wide, island_names, columns):
+    """
+    Splits get_station_data()'s frame into {island_name: frame} keyed by the
+    names passed in, keeping Time, lat, lon and the given value columns and
+    dropping stations without any of those values.
+    """
+    split = {}
+    for name in island_names:
+        rows = wide[wide["island"] == island_geometry.match_island(name)]
+        rows = rows.dropna(subset=columns, how="all")
+        split[name] = rows[["Time", "lat", "lon"] + columns].reset_index(drop=True)
+    return split
+
+
+def _load_mock_variable(variable, date_list, islands):
+    """
+    Builds one variable's station data for demo/screenshot purposes when no
+    live OAUTH_TOKEN is configured yet (or the variable has no live path),
+    using real station data downloaded from HCDP (see mock_station_csv.py).
+    """
+    prefix = VARIABLES[variable]["mock_prefix"]
+    month = mock_station_csv.available_month(date_list[0].month)
+    display_date = date_list[0].strftime("%m/%d/%Y")
+
+    if len(date_list) == 1:
+        # Daily view: real observations for that specific day
+        stations_by_island = mock_station_csv.load_station_values_for_islands(
+            prefix, islands, month, day=date_list[0].day
+        )
+    else:
+        # Monthly view: one real monthly value per station (daily readings
+        # averaged where no monthly file was downloaded)
+        stations_by_island = mock_station_csv.load_station_values_for_islands(prefix, islands, month)
+
+    frames = [
+        pd.DataFrame({
+            "Time": display_date,
+            "station_id": stations["skn"].astype(str).to_numpy(),
+            "island": island,
+            "lat": stations["lat"].to_numpy(),
+            "lon": stations["lon"].to_numpy(),
+            variable: stations["value"].to_numpy(),
+        })
+        for island, stations in stations_by_island.items()
+    ]
+    return _concat_or_empty(frames, variable)
+
+
+def _load_live_variables(variables, date_list, islands, hcdp_api_token, max_concurrency):
+    """One HCDP query per variable covering the whole period, run concurrently."""
+    # A single day for Daily view, or a {"$gte", "$lte"} date range for
+    # Monthly view (paged by hcdp_client), instead of one query per day
+    start_str = date_list[0].strftime("%Y-%m-%d")
+    end_str = date_list[-1].strftime("%Y-%m-%d")
+    date_filter = start_str if start_str == end_str else {"$gte": start_str, "$lte": end_str}
+    queries = [VARIABLES[variable]["query"] | {"date": date_filter} for variable in variables]
+
+    stations = _station_frame(hcdp_api_token, islands)
+
+    # Independent queries run concurrently (bounded by max_concurrency);
+    # pool.map keeps the results in query order.
+    workers = max(1, min(max_concurrency or HCDP_MAX_CONCURRENCY, len(queries)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda query: station_store.query_station_values(query, hcdp_api_token), queries))
+
+    display_dates = {date.strftime("%Y-%m-%d"): date.strftime("%m/%d/%Y") for date in date_list}
+    frames = []
+    for variable, records in zip(variables, results):
+        df = pd.DataFrame.from_records(records, columns=["station_id", "date", "value"]).dropna(subset=["value"])
+        df = pd.DataFrame({
+            "station_id": df["station_id"].astype(str),
+            "Time": df["date"].astype(str).str[:10].map(display_dates),
+            variable: pd.to_numeric(df["value"]).astype("float64"),
+        }).dropna(subset=["Time"])
+        df = df.drop_duplicates(subset=["station_id", "Time"], keep="last")
+        # Island membership and coordinates come from the station directory
+        # cached by hcdp_client; stations off the requested islands drop out
+        df = df.merge(stations, on="station_id", how="inner")
+        frames.append(df[KEY_COLUMNS + [variable]])
+    return frames
+
+
+def _station_frame(hcdp_api_token, islands):
+    """station_id, island, lat, lon of every directory station on the given islands."""
+    metadata = hcdp_client.get_station_metadata(hcdp_api_token)
+    island_index = hcdp_client.get_station_island_index(hcdp_api_token)
+    wanted = set(islands)
+    rows = [
+        (station_id, island, float(metadata[station_id]["lat"]), float(metadata[station_id]["lng"]))
+        for station_id, island in island_index.items() if island in wanted
+    ]
+    return pd.DataFrame(rows, columns=["station_id", "island", "lat", "lon"])
+
+
+def _merge_variables(left, right):
+    merged = left.merge(right, on=MERGE_COLUMNS, how="outer", sort=False, suffixes=("", "_right"))
+    for column in KEY_COLUMNS:
+        if column not in MERGE_COLUMNS:
+            merged[column] = merged[column].fillna(merged.pop(f"{column}_right"))
+    return merged
+
+
+def _concat_or_empty(frames, variable):
+    if frames:
+        return pd.concat(frames, ignore_index=True)
+    return pd.DataFrame({column: pd.Series(dtype="float64") for column in KEY_COLUMNS + [variable]}).astype(
+        {"Time": "object", "station_id": "object", "island": "object"}
+    )
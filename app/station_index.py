@@ -0,0 +1,56 @@
+"""
+Great-circle nearest-station lookups shared by Predictions.py (live HCDP
+station directory) and mock_station_csv.py (mock station files).
+
+An index is a scikit-learn BallTree over station lat/lon in radians with
+the haversine metric, so nearest / k-nearest queries are O(log n) and can
+be batched over many points at once. Build it once per station directory
+(see hcdp_client.get_station_spatial_index) rather than per lookup.
+"""
+
+import numpy as np
+from sklearn.neighbors import BallTree
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def build_station_index(station_ids, lats, lons):
+    """
+    Builds a spatial index over stations.
+
+    station_ids: sequence of station identifiers, aligned with lats/lons
+    lats, lons: station coordinates in degrees
+    Returns {"tree": BallTree, "station_ids": np.ndarray}, or None if there
+    are no stations.
+    """
+    station_ids = np.asarray(station_ids)
+    if len(station_ids) == 0:
+        return None
+    coords = np.radians(np.column_stack([np.asarray(lats, dtype=float), np.asarray(lons, dtype=float)]))
+    return {"tree": BallTree(coords, metric="haversine"), "station_ids": station_ids}
+
+
+def nearest_stations(index, latitudes, longitudes, k=1):
+    """
+    Batched k-nearest lookup.
+
+    latitudes, longitudes: array-likes of query points in degrees
+    Returns (station_ids, distances_km), both shaped (n_points, k) and
+    ordered nearest first. k is capped at the number of indexed stations.
+    """
+    points = np.radians(np.column_stack([
+        np.atleast_1d(np.asarray(latitudes, dtype=float)),
+        np.atleast_1d(np.asarray(longitudes, dtype=float)),
+    ]))
+    k = min(k, len(index["station_ids"]))
+    distances, positions = index["tree"].query(points, k=k)
+    return index["station_ids"][positions], distances * EARTH_RADIUS_KM
+
+
+def nearest_station(index, latitude, longitude):
+    """Returns the id of the single closest station, or None for an empty index."""
+    if index is None:
+        return None
+    station_ids, _ = nearest_stations(index, [latitude], [longitude], k=1)
+    # tolist() hands back a plain Python str/float rather than a NumPy scalar
+    return station_ids[0].tolist()[0]
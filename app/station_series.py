@@ -0,0 +1,107 @@
+"""
+Per-station daily time series from the HCDP API (through the on-disk
+station_store), cached in memory as DataFrames so repeated renders for the
+same station don't re-read or re-download years of data.
+
+Each cached series remembers the earliest date it was fetched from and
+the latest date asked for. A later request only fetches what is missing:
+days before the cached start and days after the last cached reading. The
+tail check is throttled by SERIES_REFRESH_SECONDS, because new readings
+arrive at most daily.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+import pandas as pd
+import station_store
+
+# Max station series kept in memory. Overridable via STATION_SERIES_CACHE_SIZE.
+SERIES_CACHE_SIZE = int(os.getenv("STATION_SERIES_CACHE_SIZE", "64"))
+
+# Minimum seconds between checks for readings newer than the cached ones.
+# Overridable via STATION_SERIES_REFRESH_SECONDS.
+SERIES_REFRESH_SECONDS = int(os.getenv("STATION_SERIES_REFRESH_SECONDS", str(60 * 60)))
+
+# (station_id, datatype, production) -> {"frame": DataFrame(date, value),
+#   "start": Timestamp, "end": Timestamp, "checked_at": epoch seconds}
+_series = OrderedDict()
+_series_lock = threading.Lock()
+
+
+def get_daily_series(station_id, datatype, start, end, token, production="new"):
+    """
+    Returns one station's daily readings between start and end (inclusive).
+
+    station_id: HCDP station id
+    datatype: e.g. "rainfall"
+    start, end: dates or datetimes (only the day is used)
+    token: HCDP OAUTH_TOKEN
+    Returns a date-sorted DataFrame(date, value). Days without a reading
+    are absent.
+    """
+    key = (str(station_id), datatype, production)
+    start = pd.Timestamp(start).normalize()
+    end = pd.Timestamp(end).normalize()
+
+    with _series_lock:
+        entry = _series.get(key)
+
+    now = time.time()
+    if entry is None:
+        entry = {
+            "frame": _fetch(station_id, datatype, production, start, end, token),
+            "start": start,
+            "end": end,
+            "checked_at": now,
+        }
+    else:
+        entry = dict(entry)
+        frames = [entry["frame"]]
+        if start < entry["start"]:
+            frames.insert(0, _fetch(station_id, datatype, production, start, entry["start"] - pd.Timedelta(days=1), token))
+            entry["start"] = start
+
+        last_date = entry["frame"]["date"].max() if len(entry["frame"]) else entry["start"] - pd.Timedelta(days=1)
+        stale = now - entry["checked_at"] >= SERIES_REFRESH_SECONDS
+        if end > last_date and (end > entry["end"] or stale):
+            frames.append(_fetch(station_id, datatype, production, last_date + pd.Timedelta(days=1), end, token))
+            entry["end"] = max(entry["end"], end)
+            entry["checked_at"] = now
+
+        if len(frames) > 1:
+            entry["frame"] = (
+                pd.concat(frames, ignore_index=True)
+                .drop_duplicates(subset="date", keep="last")
+                .sort_values("date", ignore_index=True)
+            )
+
+    with _series_lock:
+        _series[key] = entry
+        _series.move_to_end(key)
+        while len(_series) > SERIES_CACHE_SIZE:
+            _series.popitem(last=False)
+
+    frame = entry["frame"]
+    return frame[(frame["date"] >= start) & (frame["date"] <= end)].reset_index(drop=True)
+
+
+def _fetch(station_id, datatype, production, start, end, token):
+    values = {
+        "station_id": station_id,
+        "datatype": datatype,
+        "production": production,
+        "period": "day",
+        "fill": "partial",
+        "date": {
+            "$gte": start.strftime("%Y-%m-%d"),
+            "$lte": end.strftime("%Y-%m-%d")
+        }
+    }
+    records = station_store.query_station_values(values, token)
+    df = pd.DataFrame.from_records(records, columns=["date", "value"]).dropna(subset=["value"])
+    return pd.DataFrame({
+        "date": pd.to_datetime(df["date"], format="ISO8601").dt.normalize(),
+        "value": pd.to_numeric(df["value"]).astype("float64"),
+    }).sort_values("date", ignore_index=True)
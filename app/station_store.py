@@ -0,0 +1,166 @@
+"""
+Append-only on-disk store of HCDP daily station values, consulted by
+station_data.py and station_series.py (Predictions.py) before the API.
+
+Values live in a SQLite file under HCDP_CACHE_DIR, keyed by datatype /
+production / aggregation / period / fill / station / date. A separate
+coverage table records which (filter, date) combinations have been fully
+downloaded, either for one station or for every station ("*"), so a
+query only sends the API its missing date ranges. Once the store has
+seen a date range, later queries for it are answered locally.
+
+HCDP keeps revising the most recent days, so dates newer than
+STORE_FINAL_AFTER_DAYS are stored but never marked as covered, and are
+re-downloaded each time they are asked for.
+"""
+
+import os
+from datetime import date, datetime, timedelta
+import hcdp_client
+import sqlite_cache
+
+STORE_PATH = os.path.join(hcdp_client.CACHE_DIR, "station_values.sqlite") if hcdp_client.CACHE_DIR else None
+
+# Days after which a reading is treated as final. Overridable via
+# HCDP_STORE_FINAL_AFTER_DAYS.
+STORE_FINAL_AFTER_DAYS = int(os.getenv("HCDP_STORE_FINAL_AFTER_DAYS", "30"))
+
+# Filter keys that identify a series; anything else (other than station_id
+# and date) is passed through to the API but not part of the store key.
+_SERIES_KEYS = ("datatype", "production", "aggregation", "period", "fill")
+
+ALL_STATIONS = "*"
+
+
+def query_station_values(values, token):
+    """
+    Drop-in replacement for
+    hcdp_client.query_all_stations(values, "hcdp_station_value", token)
+    that serves whatever it can from the store and only fetches missing
+    dates.
+
+    values: the usual value.<key> filters; "date" is either one
+            "YYYY-MM-DD" string or {"$gte": ..., "$lte": ...}
+    Returns a list of {"station_id", "date", "value"} dicts (value is a
+    float, date a "YYYY-MM-DD" string).
+    """
+    if not STORE_PATH or "date" not in values:
+        return hcdp_client.query_all_stations(values, "hcdp_station_value", token)
+
+    start, end = _date_bounds(values["date"])
+    series = tuple(str(values.get(key, "")) for key in _SERIES_KEYS)
+    station_id = values.get("station_id")
+    scope = str(station_id) if station_id is not None else ALL_STATIONS
+
+    with _connect() as conn:
+        covered = _covered_dates(conn, series, scope, start, end)
+    for run_start, run_end in _missing_runs(start, end, covered):
+        _download(values, series, scope, run_start, run_end, token)
+
+    sql = (
+        "SELECT station_id, date, value FROM station_values WHERE "
+        + " AND ".join(f"{key} = ?" for key in _SERIES_KEYS)
+        + " AND date BETWEEN ? AND ?"
+    )
+    params = [*series, start.isoformat(), end.isoformat()]
+    if station_id is not None:
+        sql += " AND station_id = ?"
+        params.append(scope)
+    with _connect() as conn:
+        rows = conn.execute(sql + " ORDER BY date, station_id", params).fetchall()
+    return [{"station_id": sid, "date": day, "value": value} for sid, day, value in rows]
+
+
+def _download(values, series, scope, run_start, run_end, token):
+    query = dict(values)
+    query["date"] = run_start.isoformat() if run_start == run_end else {
+        "$gte": run_start.isoformat(),
+        "$lte": run_end.isoformat()
+    }
+    # Pages are written as they arrive (the next one is prefetched
+    # meanwhile), so a long range is never held in memory in full
+    for page in hcdp_client.iter_station_pages(query, "hcdp_station_value", token):
+        rows = [
+            (*series, str(r["station_id"]), r["date"][:10], float(r["value"]))
+            for r in page if "value" in r and "station_id" in r
+        ]
+        with sqlite_cache.write_lock, _connect() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO station_values ({', '.join(_SERIES_KEYS)}, station_id, date, value) "
+                f"VALUES ({', '.join('?' * (len(_SERIES_KEYS) + 3))})",
+                rows,
+            )
+
+    # Only marked as covered once every page has been stored
+    final_before = date.today() - timedelta(days=STORE_FINAL_AFTER_DAYS)
+    covered_days = []
+    day = run_start
+    while day <= min(run_end, final_before):
+        covered_days.append((*series, scope, day.isoformat()))
+        day += timedelta(days=1)
+
+    with sqlite_cache.write_lock, _connect() as conn:
+        conn.executemany(
+            f"INSERT OR IGNORE INTO coverage ({', '.join(_SERIES_KEYS)}, scope, date) "
+            f"VALUES ({', '.join('?' * (len(_SERIES_KEYS) + 2))})",
+            covered_days,
+        )
+
+
+def _covered_dates(conn, series, scope, start, end):
+    # A statewide download also covers every single station
+    scopes = (scope, ALL_STATIONS)
+    rows = conn.execute(
+        "SELECT DISTINCT date FROM coverage WHERE "
+        + " AND ".join(f"{key} = ?" for key in _SERIES_KEYS)
+        + " AND scope IN (?, ?) AND date BETWEEN ? AND ?",
+        [*series, *scopes, start.isoformat(), end.isoformat()],
+    ).fetchall()
+    return {row[0] for row in rows}
+
+
+def _missing_runs(start, end, covered):
+    """Yields (run_start, run_end) for each contiguous run of uncovered days."""
+    run_start = None
+    day = start
+    while day <= end:
+        if day.isoformat() in covered:
+            if run_start is not None:
+                yield run_start, day - timedelta(days=1)
+                run_start = None
+        elif run_start is None:
+            run_start = day
+        day += timedelta(days=1)
+    if run_start is not None:
+        yield run_start, end
+
+
+def _date_bounds(date_filter):
+    if isinstance(date_filter, dict):
+        return _to_date(date_filter["$gte"]), _to_date(date_filter["$lte"])
+    return _to_date(date_filter), _to_date(date_filter)
+
+
+def _to_date(value):
+    return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+
+
+def _connect():
+    return sqlite_cache.connect(STORE_PATH, _create_schema)
+
+
+def _create_schema(conn):
+    key_columns = ", ".join(f"{key} TEXT NOT NULL" for key in _SERIES_KEYS)
+    series_columns = ", ".join(_SERIES_KEYS)
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS station_values ({key_columns}, station_id TEXT NOT NULL, "
+        f"date TEXT NOT NULL, value REAL NOT NULL, PRIMARY KEY ({series_columns}, station_id, date))"
+    )
+    # Statewide reads filter on the series and a date range, not a station
+    conn.execute(
+        f"CREATE INDEX IF NOT EXISTS station_values_by_date ON station_values ({series_columns}, date)"
+    )
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS coverage ({key_columns}, scope TEXT NOT NULL, date TEXT NOT NULL, "
+        f"PRIMARY KEY ({series_columns}, scope, date))"
+    )
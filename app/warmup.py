@@ -0,0 +1,81 @@
+"""
+Cache warmup for the dashboard's default views, so the first real page
+load after a deploy doesn't pay for the station directory, station values
+and forecast models itself.
+
+Run it as a separate process (python app/warmup.py), or let entrypoint.sh
+start it in the background next to Streamlit by setting WARMUP_ON_START=1
+in the container environment. It fills the on-disk caches under
+HCDP_CACHE_DIR (station metadata, station_store values, fitted forecast
+models), which the app process then reads instead of the API. Without an
+OAUTH_TOKEN it prepares the memory-mapped copies of the mock CSVs instead.
+"""
+
+import os
+import traceback
+import dashboard_defaults
+import data_function
+import temp
+import humidity
+import island_summary
+import hcdp_client
+import mock_station_csv
+import Predictions
+
+# The dashboard's default inputs (see dashboard_defaults.py)
+DEFAULT_DATES = [dashboard_defaults.DEFAULT_DAILY_DATE, dashboard_defaults.DEFAULT_MONTHLY_DATE]
+ISLANDS = dashboard_defaults.ALL_ISLANDS
+
+# Distinct (latitude, longitude) passed to show_rainfall_forecast by the
+# forecast pages
+FORECAST_LOCATIONS = list(dict.fromkeys(dashboard_defaults.FORECAST_LOCATIONS.values()))
+
+
+def warm_caches(dates=None, forecast_month=dashboard_defaults.DEFAULT_FORECAST_MONTH):
+    """
+    Computes every default view once, so their data ends up in the caches.
+
+    dates: dashboard date inputs to warm (defaults to DEFAULT_DATES)
+    forecast_month: "MM/YYYY" month for the island forecasts
+    Returns a list of (step name, error message) for the steps that failed;
+    a failing step doesn't stop the others.
+    """
+    hcdp_api_token = os.getenv("OAUTH_TOKEN")
+    steps = []
+    if hcdp_api_token:
+        steps.append(("station metadata", lambda: hcdp_client.get_station_spatial_index(hcdp_api_token)))
+    else:
+        steps.append(("mock columnar copies", mock_station_csv.convert_mock_data))
+
+    for date_input in dates or DEFAULT_DATES:
+        # The island maps, then the island aggregates behind the overview
+        # metrics and island_bar_chart
+        steps.append((f"rainfall {date_input}", lambda d=date_input: data_function.get_station_data_for_islands(d, ISLANDS, "rainfall")))
+        steps.append((f"temperature {date_input}", lambda d=date_input: temp.get_station_data_for_islands_temp(d, ISLANDS, "temperature")))
+        steps.append((f"humidity {date_input}", lambda d=date_input: humidity.get_station_data_for_islands_humidity(d, ISLANDS)))
+        steps.append((f"island summaries {date_input}", lambda d=date_input: island_summary.get_island_summaries(d, ISLANDS)))
+
+    steps.append((
+        f"forecasts {forecast_month}",
+        lambda: Predictions.generate_rainfall_forecasts(
+            forecast_month,
+            [lat for lat, _ in FORECAST_LOCATIONS],
+            [lon for _, lon in FORECAST_LOCATIONS],
+        ),
+    ))
+
+    failures = []
+    for name, step in steps:
+        try:
+            step()
+        except Exception as e:
+            failures.append((name, str(e)))
+            traceback.print_exc()
+    return failures
+
+
+if __name__ == "__main__":
+    failed = warm_caches()
+    for name, error in failed:
+        print(f"Warmup step '{name}' failed: {error}")
+    print("Warmup finished" + (f" with {len(failed)} failed step(s)" if failed else ""))
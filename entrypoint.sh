@@ -7,5 +7,11 @@ set -e
 
 # You can put other setup logic here
 
+# Fill the data/model caches for the dashboard's default views in the
+# background, so the first page load doesn't have to (see app/warmup.py)
+if [ "${WARMUP_ON_START:-0}" = "1" ]; then
+    python app/warmup.py &
+fi
+
 # Evaluating passed command:
 exec "$@"